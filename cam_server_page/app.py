@@ -96,7 +96,7 @@ if 'streaming' not in st.session_state:
 
 # Update processor based on selected mode
 mode_enum = ProcessingMode(processing_mode)
-st.session_state.processor = create_processor(mode_enum, **mode_kwargs)
+st.session_state.processor = create_processor(mode_enum, gray_output=True, **mode_kwargs)
 
 if not enable_processing:
     st.session_state.processor.disable()
@@ -138,11 +138,10 @@ def display_stream():
             # Process the frame
             processed_frame = st.session_state.processor.process(frame)
 
-            # Convert BGR to RGB for display
-            frame_rgb = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-
-            # Display the frame
-            st.image(frame_rgb, channels="RGB", width="stretch")
+            # Display the frame (st.image reorders BGR itself, no cvtColor copy;
+            # single-channel results are shown as grayscale directly)
+            channels = "BGR" if processed_frame.ndim == 3 else "RGB"
+            st.image(processed_frame, channels=channels, width="stretch")
 
             # Update stats
             st.session_state.frame_count += 1
@@ -1,6 +1,49 @@
+import os
 import streamlit as st
 import cv2
-import time
+import threading
+
+# Stop FFmpeg from pre-buffering the network stream (lower latency).
+# Must be set before any capture is opened; an existing value is respected.
+os.environ.setdefault(
+    "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+    "fflags;nobuffer|flags;low_delay|max_delay;0|reorder_queue_size;0"
+)
+
+
+def grab_frames(cap, slot):
+    """
+    Continuously read frames in a background thread, keeping only the latest.
+
+    Draining the capture here means the display loop never receives a stale
+    frame from OpenCV's internal buffer.
+    """
+    while slot['running']:
+        ret, frame = cap.read()
+        with slot['lock']:
+            slot['frame'] = frame if ret else None
+            slot['ok'] = ret and frame is not None
+        slot['new_frame'].set()
+        if not slot['ok']:
+            break
+
+
+def stop_grabber():
+    """Stop the frame grabber thread and release the camera."""
+    slot = st.session_state.frame_slot
+    grabber_alive = False
+    if slot is not None:
+        slot['running'] = False
+        slot['thread'].join(timeout=1.0)
+        grabber_alive = slot['thread'].is_alive()
+        st.session_state.frame_slot = None
+    if st.session_state.cap is not None:
+        # A stalled stream can leave the grabber inside cap.read(); the daemon
+        # thread and its capture are then left to end on their own
+        if not grabber_alive:
+            st.session_state.cap.release()
+        st.session_state.cap = None
+
 
 # Configure Streamlit page
 st.set_page_config(
@@ -32,6 +75,7 @@ with st.sidebar:
 if 'cap' not in st.session_state:
     st.session_state.cap = None
     st.session_state.connected = False
+    st.session_state.frame_slot = None
 
 if 'frame_count' not in st.session_state:
     st.session_state.frame_count = 0
@@ -41,12 +85,28 @@ col1, col2 = st.columns([1, 1])
 
 with col1:
     if st.button("🔌 Connect to Camera", type="primary"):
-        if st.session_state.cap is not None:
-            st.session_state.cap.release()
+        stop_grabber()
         
         st.session_state.cap = cv2.VideoCapture(camera_url)
         
         if st.session_state.cap.isOpened():
+            # Keep only the newest frame in OpenCV's buffer
+            st.session_state.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
+            # Start background grabber; the display loop only reads the latest frame
+            slot = {
+                'frame': None,
+                'ok': True,
+                'running': True,
+                'lock': threading.Lock(),
+                'new_frame': threading.Event(),
+            }
+            slot['thread'] = threading.Thread(
+                target=grab_frames, args=(st.session_state.cap, slot), daemon=True
+            )
+            slot['thread'].start()
+            st.session_state.frame_slot = slot
+            
             st.session_state.connected = True
             st.success("✓ Connected successfully!")
         else:
@@ -55,34 +115,36 @@ with col1:
 
 with col2:
     if st.button("🔌 Disconnect"):
-        if st.session_state.cap is not None:
-            st.session_state.cap.release()
-            st.session_state.cap = None
+        stop_grabber()
         st.session_state.connected = False
         st.info("Disconnected from camera")
 
 # Main display area
-if st.session_state.connected and st.session_state.cap is not None:
+if st.session_state.connected and st.session_state.frame_slot is not None:
     # Create placeholder for video
     video_placeholder = st.empty()
     stats_placeholder = st.empty()
+    slot = st.session_state.frame_slot
     
-    # Stream loop
+    # Stream loop - render whenever the grabber publishes a new frame
     while st.session_state.connected:
-        ret, frame = st.session_state.cap.read()
+        if not slot['new_frame'].wait(timeout=1.0):
+            continue
+        slot['new_frame'].clear()
         
-        if not ret or frame is None:
+        with slot['lock']:
+            ok = slot['ok']
+            frame = slot['frame']
+        
+        if not ok:
             st.error("Failed to read frame from camera. Stream may have ended.")
             st.session_state.connected = False
             break
         
-        # Convert BGR to RGB for display (no processing)
-        display_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Display
+        # Display (no processing; st.image reorders BGR itself, no cvtColor copy)
         video_placeholder.image(
-            display_frame,
-            channels="RGB",
+            frame,
+            channels="BGR",
             width="stretch",
             caption=f"Frame: {st.session_state.frame_count}"
         )
@@ -91,9 +153,6 @@ if st.session_state.connected and st.session_state.cap is not None:
         st.session_state.frame_count += 1
         stats_placeholder.metric("Frames Displayed", st.session_state.frame_count)
         
-        # Small delay to prevent overwhelming the browser
-        time.sleep(0.033)  # ~30 FPS max
-        
 else:
     st.info("👆 Click 'Connect to Camera' to start streaming")
     
@@ -123,5 +182,4 @@ else:
 
 # Cleanup on app close
 if not st.session_state.get('connected', False):
-    if st.session_state.get('cap') is not None:
-        st.session_state.cap.release()
+    stop_grabber()
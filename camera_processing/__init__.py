@@ -8,6 +8,7 @@ for DroidCam or other camera sources.
 Modules:
     - image_filters: Image processing pipeline and filters
     - aruco_detector: ArUco marker detection and depth estimation
+    - camera_stream: MJPEG HTTP stream client (libjpeg-turbo decoding when available)
 
 Example usage:
     import cv2
@@ -38,6 +39,7 @@ from .image_filters import (
     apply_sharpen,
     adjust_brightness,
     adjust_contrast,
+    adjust_brightness_contrast,
     apply_threshold,
     add_timestamp,
     add_text_overlay,
@@ -49,6 +51,8 @@ from .aruco_detector import (
     save_aruco_marker,
 )
 
+from .camera_stream import CameraStreamClient
+
 __version__ = "2.0.0"
 __all__ = [
     # Image filters
@@ -62,6 +66,7 @@ __all__ = [
     "apply_sharpen",
     "adjust_brightness",
     "adjust_contrast",
+    "adjust_brightness_contrast",
     "apply_threshold",
     "add_timestamp",
     "add_text_overlay",
@@ -69,4 +74,6 @@ __all__ = [
     "ArucoDetector",
     "generate_aruco_marker",
     "save_aruco_marker",
+    # Camera stream
+    "CameraStreamClient",
 ]
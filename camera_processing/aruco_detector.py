@@ -3,16 +3,40 @@ ArUco Marker Detection for Depth Estimation
 ============================================
 
 This module provides ArUco marker detection and depth estimation based on marker size.
+
+Detection uses OpenCV's ArUco module by default; the optional nanofractal
+backend (a compiled detector that releases the GIL) is used instead when
+requested and installed.
 """
 
 import cv2
+import math
+import time
 import numpy as np
-from typing import List, Tuple, Dict, Optional
+from typing import Callable, List, Tuple, Dict, Optional
 import logging
 
+try:
+    import nanofractal
+except ImportError:
+    nanofractal = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maps flattened marker corners [x0, y0, ..., x3, y3] to the x/y components of
+# the top edge (0-1), bottom edge (2-3), center, and both diagonals (0-2, 1-3)
+_CORNER_GEOMETRY = np.kron(np.array([
+    [1.0, -1.0, 0.0, 0.0],
+    [0.0, 0.0, 1.0, -1.0],
+    [0.25, 0.25, 0.25, 0.25],
+    [-1.0, 0.0, 1.0, 0.0],
+    [0.0, -1.0, 0.0, 1.0],
+]).T, np.eye(2))
+
+# Same termination criteria as the ArUco module's sub-pixel refinement defaults
+_SUBPIX_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.1)
+
 
 class ArucoDetector:
     """
@@ -25,6 +49,9 @@ class ArucoDetector:
     - DICT_7X7_50, DICT_7X7_100, DICT_7X7_250, DICT_7X7_1000
     """
     
+    # With roi_detection, frames between full-frame detections
+    FULL_DETECT_INTERVAL = 10
+    
     # ArUco dictionary types
     ARUCO_DICT = {
         "DICT_4X4_50": cv2.aruco.DICT_4X4_50,
@@ -51,7 +78,13 @@ class ArucoDetector:
         marker_size_cm: float = 10.0,
         camera_matrix: Optional[np.ndarray] = None,
         dist_coeffs: Optional[np.ndarray] = None,
-        focal_length_px: float = 1000.0
+        focal_length_px: float = 1000.0,
+        roi_detection: bool = False,
+        corner_refinement: bool = True,
+        backend: str = "opencv",
+        detection_scale: float = 1.0,
+        use_opencl: Optional[bool] = None,
+        min_marker_perimeter_rate: float = 0.03
     ):
         """
         Initialize ArUco detector with optimized parameters.
@@ -62,32 +95,95 @@ class ArucoDetector:
             camera_matrix: Camera calibration matrix (3x3)
             dist_coeffs: Camera distortion coefficients
             focal_length_px: Focal length in pixels (if camera_matrix not provided)
+            roi_detection: Localize candidate markers at half resolution and
+                decode only inside their regions instead of the full frame
+                (full-frame detection still runs when the regions yield no
+                marker, and every FULL_DETECT_INTERVAL frames)
+            corner_refinement: Refine corners to sub-pixel accuracy (disable
+                for speed when distance precision is not needed)
+            backend: "opencv" or "nanofractal" (falls back to OpenCV if the
+                nanofractal package is not installed)
+            detection_scale: Run thresholding/contour search on the frame
+                downscaled by this factor (e.g. 0.5); corners are still
+                refined against the full-resolution image
+            use_opencl: Pass frames to the OpenCV detector as cv2.UMat so its
+                thresholding can run on an OpenCL device. None enables it when
+                a device is available; it is dropped again if the first
+                detection is not faster than on the CPU
+            min_marker_perimeter_rate: Smallest marker perimeter searched for,
+                as a fraction of the frame's larger dimension. Raising it
+                (e.g. to 0.05, ~16px per side at 1280px) prunes small contours
+                early but misses distant markers
         """
         if aruco_dict_type not in self.ARUCO_DICT:
             raise ValueError(f"Invalid ArUco dictionary type: {aruco_dict_type}")
+        if backend not in ("opencv", "nanofractal"):
+            raise ValueError(f"Invalid ArUco detector backend: {backend}")
         
         self.aruco_dict_type = aruco_dict_type
         self.aruco_dict = cv2.aruco.getPredefinedDictionary(self.ARUCO_DICT[aruco_dict_type])
         
-        # Configure detection parameters for better detection
+        # Configure detection parameters once; the detector below is reused for every frame
         self.aruco_params = cv2.aruco.DetectorParameters()
         self.aruco_params.adaptiveThreshWinSizeMin = 3
         self.aruco_params.adaptiveThreshWinSizeMax = 23
         self.aruco_params.adaptiveThreshWinSizeStep = 10
-        self.aruco_params.minMarkerPerimeterRate = 0.03
+        self.aruco_params.minMarkerPerimeterRate = min_marker_perimeter_rate
         self.aruco_params.maxMarkerPerimeterRate = 4.0
         self.aruco_params.polygonalApproxAccuracyRate = 0.05
-        self.aruco_params.cornerRefinementMethod = cv2.aruco.CORNER_REFINE_SUBPIX
-        self.aruco_params.cornerRefinementWinSize = 5
+        self.corner_refinement = corner_refinement
+        self.detection_scale = detection_scale
+        if corner_refinement and detection_scale >= 1.0:
+            self.aruco_params.cornerRefinementMethod = cv2.aruco.CORNER_REFINE_SUBPIX
+            self.aruco_params.cornerRefinementWinSize = 5
+        else:
+            # Scaled detection refines the corners itself, at full resolution
+            self.aruco_params.cornerRefinementMethod = cv2.aruco.CORNER_REFINE_NONE
         
         self.detector = cv2.aruco.ArucoDetector(self.aruco_dict, self.aruco_params)
         
+        # Optional compiled backend; always refines corners to sub-pixel accuracy
+        self._nf = None
+        if backend == "nanofractal":
+            if nanofractal is None:
+                logger.warning("nanofractal not installed, using OpenCV ArUco detector")
+            else:
+                nf_params = nanofractal.DetectorParams()
+                nf_params.approx_poly_rate = self.aruco_params.polygonalApproxAccuracyRate
+                nf_params.detection_scale = detection_scale
+                self._nf = nanofractal.ArucoDetector(nanofractal.Dict[aruco_dict_type], params=nf_params)
+        self.backend = "nanofractal" if self._nf is not None else "opencv"
+        
+        if use_opencl is None:
+            use_opencl = self._nf is None and cv2.ocl.haveOpenCL()
+        self.use_opencl = use_opencl
+        self._opencl_probe = use_opencl  # Compare against the CPU on the first detection
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        
         self.marker_size_cm = marker_size_cm
         self.camera_matrix = camera_matrix
         self.dist_coeffs = dist_coeffs
         self.focal_length_px = focal_length_px
         
-        logger.info(f"ArUco detector initialized with {aruco_dict_type}")
+        # Pose estimation inputs that do not change between calls
+        half_size = marker_size_cm / 2
+        self._marker_points = np.array([
+            [-half_size, half_size, 0],
+            [half_size, half_size, 0],
+            [half_size, -half_size, 0],
+            [-half_size, -half_size, 0]
+        ], dtype=np.float32)
+        self._zero_dist = np.zeros((5, 1))
+        
+        # Two-stage ROI detection state
+        self.roi_detection = roi_detection
+        self._track_rois = None  # Regions around the last detections, used to skip localization
+        self._frames_since_full = 0
+        self._gray = None  # Grayscale buffer reused across frames of the same size
+        self._small = None  # Downscaled buffer for detection_scale < 1
+        
+        logger.info(f"ArUco detector initialized with {aruco_dict_type} ({self.backend})")
         logger.info(f"Marker size: {marker_size_cm} cm")
     
     def detect(self, frame: np.ndarray) -> Tuple[List, List, List]:
@@ -103,9 +199,215 @@ class ArucoDetector:
             - ids: List of marker IDs
             - rejected_points: List of rejected candidate corners
         """
-        corners, ids, rejected = self.detector.detectMarkers(frame)
+        gray = self._to_gray(frame)
+        
+        if not self.roi_detection:
+            corners, ids, rejected = self._detect_markers(gray)
+            return corners, ids, rejected
+        
+        # Tracking only decodes around known markers, so a periodic full-frame
+        # pass is what picks up markers that appear elsewhere
+        self._frames_since_full += 1
+        if self._frames_since_full < self.FULL_DETECT_INTERVAL:
+            # Tracking: try the regions around the previous detections first
+            if self._track_rois is not None:
+                corners, ids, rejected = self._detect_in_rois(gray, self._track_rois)
+                if ids is not None:
+                    self._update_track_rois(corners, gray.shape)
+                    return corners, ids, rejected
+                self._track_rois = None
+            
+            # Localization: cheap half-resolution pass to find square candidates
+            rois = self._find_candidate_rois(gray)
+            if rois is not None:
+                corners, ids, rejected = self._detect_in_rois(gray, rois)
+                if ids is not None:
+                    self._update_track_rois(corners, gray.shape)
+                    return corners, ids, rejected
+        
+        # Nothing found in the regions (or due for a full pass): full-frame detection
+        corners, ids, rejected = self._detect_markers(gray)
+        self._frames_since_full = 0
+        self._track_rois = None
+        if ids is not None:
+            self._update_track_rois(corners, gray.shape)
         return corners, ids, rejected
     
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Grayscale view of the frame, converted at most once per frame.
+        
+        Every detection stage (localization, ROI decoding, corner refinement)
+        works on this single-channel image, so color input is converted here
+        into a reused buffer instead of inside each OpenCV call.
+        """
+        if frame.ndim == 2:
+            return frame
+        if self._gray is None or self._gray.shape != frame.shape[:2]:
+            self._gray = np.empty(frame.shape[:2], dtype=np.uint8)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+    
+    def _detect_markers(self, gray: np.ndarray) -> Tuple[List, Optional[np.ndarray], List]:
+        """Run the configured backend on a grayscale image, in cv2.aruco.detectMarkers format."""
+        if self._nf is None:
+            if self.detection_scale >= 1.0:
+                return self._run_detector(gray)
+            return self._detect_scaled(gray)
+        
+        # nanofractal needs C-contiguous input (ROI slices are strided views)
+        result = self._nf.detect(np.ascontiguousarray(gray))
+        if len(result) == 0:
+            return (), None, ()
+        corners = tuple(result.corners.reshape(-1, 1, 4, 2))
+        return corners, result.ids.reshape(-1, 1), ()
+    
+    def _run_detector(self, gray: np.ndarray) -> Tuple[List, Optional[np.ndarray], List]:
+        """cv2 detectMarkers, through OpenCL (cv2.UMat) while that is the faster path."""
+        if not self.use_opencl:
+            return self.detector.detectMarkers(gray)
+        
+        if self._opencl_probe:
+            self._opencl_probe = False
+            result = self._detect_umat(gray)  # Warm-up: compiles the OpenCL kernels
+            umat_time = min(self._time_call(self._detect_umat, gray) for _ in range(3))
+            cpu_time = min(self._time_call(self.detector.detectMarkers, gray) for _ in range(3))
+            if umat_time >= cpu_time:
+                self.use_opencl = False
+            logger.info(f"ArUco detection on OpenCL: {umat_time * 1000:.1f} ms, CPU: "
+                        f"{cpu_time * 1000:.1f} ms ({'OpenCL' if self.use_opencl else 'CPU'} kept)")
+            return result
+        
+        return self._detect_umat(gray)
+    
+    @staticmethod
+    def _time_call(func: Callable, *args) -> float:
+        """Wall time of one call, in seconds."""
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+    
+    def _detect_umat(self, gray: np.ndarray) -> Tuple[List, Optional[np.ndarray], List]:
+        """detectMarkers on a cv2.UMat, with the results downloaded to numpy."""
+        corners, ids, rejected = self.detector.detectMarkers(cv2.UMat(gray))
+        return (
+            tuple(c.get() for c in corners),
+            ids.get() if corners else None,
+            tuple(r.get() for r in rejected)
+        )
+    
+    def _detect_scaled(self, gray: np.ndarray) -> Tuple[List, Optional[np.ndarray], List]:
+        """Detect on a downscaled copy, then map the corners back and refine them at full resolution."""
+        height, width = gray.shape[:2]
+        size = (max(1, int(width * self.detection_scale)), max(1, int(height * self.detection_scale)))
+        if self._small is None or self._small.shape != (size[1], size[0]):
+            self._small = np.empty((size[1], size[0]), dtype=np.uint8)
+        small = cv2.resize(gray, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        corners, ids, rejected = self._run_detector(small)
+        
+        # Pixel centers of the small image back to full-resolution coordinates
+        scale = np.array([width / size[0], height / size[1]], dtype=np.float32)
+        shift = 0.5 * scale - 0.5
+        rejected = tuple(r * scale + shift for r in rejected)
+        if ids is None:
+            return corners, ids, rejected
+        
+        points = np.concatenate(corners).reshape(-1, 1, 2) * scale + shift
+        if self.corner_refinement:
+            cv2.cornerSubPix(gray, points, (5, 5), (-1, -1), _SUBPIX_CRITERIA)
+        return tuple(points.reshape(-1, 1, 4, 2)), ids, rejected
+    
+    def _update_track_rois(self, corners: List, shape: Tuple[int, ...]):
+        """Remember a generously padded region per marker to allow for motion between frames."""
+        self._track_rois = self._merge_overlapping(
+            [self._padded_bounds(c.reshape(-1, 2), shape, pad_ratio=0.5) for c in corners]
+        )
+    
+    @staticmethod
+    def _merge_overlapping(boxes: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+        """Union intersecting boxes so no marker is decoded twice."""
+        merged = []
+        for box in sorted(boxes, key=lambda b: (b[2] - b[0]) * (b[3] - b[1]), reverse=True):
+            x0, y0, x1, y1 = box
+            i = 0
+            while i < len(merged):
+                a0, b0, a1, b1 = merged[i]
+                if x0 < a1 and a0 < x1 and y0 < b1 and b0 < y1:
+                    x0, y0, x1, y1 = min(x0, a0), min(y0, b0), max(x1, a1), max(y1, b1)
+                    merged.pop(i)
+                    i = 0
+                else:
+                    i += 1
+            merged.append((x0, y0, x1, y1))
+        return merged
+    
+    def _find_candidate_rois(self, gray: np.ndarray) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        Locate square-like dark blobs at half resolution (Otsu + contours).
+        
+        Args:
+            gray: Full-resolution grayscale frame
+        
+        Returns:
+            List of padded (x0, y0, x1, y1) regions in full-resolution coordinates,
+            or None if the regions would not be cheaper than the full frame
+        """
+        small = cv2.resize(gray, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+        _, binary = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        
+        # The rate times the largest image dimension is already a perimeter in pixels
+        min_perimeter = self.aruco_params.minMarkerPerimeterRate * max(small.shape)
+        boxes = []
+        for contour in contours:
+            perimeter = cv2.arcLength(contour, True)
+            if perimeter < min_perimeter:
+                continue
+            approx = cv2.approxPolyDP(contour, 0.05 * perimeter, True)
+            if len(approx) != 4 or not cv2.isContourConvex(approx):
+                continue
+            boxes.append(self._padded_bounds(approx.reshape(-1, 2) * 2, gray.shape))
+        
+        if not boxes:
+            return None
+        
+        # Inner marker cells and neighbouring markers produce overlapping boxes
+        rois = self._merge_overlapping(boxes)
+        
+        roi_area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rois)
+        if roi_area > 0.5 * gray.shape[0] * gray.shape[1]:
+            return None
+        return rois
+    
+    def _detect_in_rois(self, gray: np.ndarray, rois: List[Tuple[int, int, int, int]]) -> Tuple[List, Optional[np.ndarray], List]:
+        """Run full ArUco decoding inside each region and map results back to frame coordinates."""
+        all_corners, all_ids, all_rejected = [], [], []
+        for x0, y0, x1, y1 in rois:
+            corners, ids, rejected = self._detect_markers(gray[y0:y1, x0:x1])
+            offset = np.array([x0, y0], dtype=np.float32)
+            all_rejected.extend(r + offset for r in rejected)
+            if ids is None:
+                continue
+            all_corners.extend(c + offset for c in corners)
+            all_ids.append(ids)
+        
+        if not all_ids:
+            return tuple(all_corners), None, tuple(all_rejected)
+        return tuple(all_corners), np.vstack(all_ids), tuple(all_rejected)
+    
+    @staticmethod
+    def _padded_bounds(points: np.ndarray, shape: Tuple[int, ...], pad_ratio: float = 0.125) -> Tuple[int, int, int, int]:
+        """Bounding box of points padded by pad_ratio of its size, clipped to the frame."""
+        x0, y0 = points.min(axis=0)
+        x1, y1 = points.max(axis=0)
+        pad = max(x1 - x0, y1 - y0) * pad_ratio + 2
+        height, width = shape[:2]
+        return (
+            max(0, int(x0 - pad)),
+            max(0, int(y0 - pad)),
+            min(width, int(np.ceil(x1 + pad))),
+            min(height, int(np.ceil(y1 + pad)))
+        )
+    
     def estimate_distance(self, corners: np.ndarray) -> float:
         """
         Estimate distance to marker based on its perceived size.
@@ -118,9 +420,11 @@ class ArucoDetector:
         Returns:
             Estimated distance in centimeters
         """
-        # Calculate marker width in pixels (average of top and bottom edge)
-        top_edge = np.linalg.norm(corners[0][0] - corners[0][1])
-        bottom_edge = np.linalg.norm(corners[0][2] - corners[0][3])
+        # Calculate marker width in pixels (average of top and bottom edge);
+        # on four points plain floats beat per-edge NumPy calls
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = corners[0].tolist()
+        top_edge = math.hypot(x0 - x1, y0 - y1)
+        bottom_edge = math.hypot(x2 - x3, y2 - y3)
         perceived_width_px = (top_edge + bottom_edge) / 2.0
         
         # Distance = (Real_Size × Focal_Length) / Perceived_Size
@@ -147,36 +451,49 @@ class ArucoDetector:
             Tuple of (rvec, tvec) - rotation and translation vectors
             Returns (None, None) if camera calibration not available
         """
+        return self.estimate_poses([corners], camera_matrix, dist_coeffs)[0]
+    
+    def estimate_poses(
+        self,
+        corners: List,
+        camera_matrix: Optional[np.ndarray] = None,
+        dist_coeffs: Optional[np.ndarray] = None
+    ) -> List[Tuple[Optional[np.ndarray], Optional[np.ndarray]]]:
+        """
+        Estimate the pose of every detected marker.
+        Requires camera calibration.
+        
+        Args:
+            corners: Detected marker corners
+            camera_matrix: Camera calibration matrix (uses instance default if None)
+            dist_coeffs: Distortion coefficients (uses instance default if None)
+        
+        Returns:
+            List of (rvec, tvec) per marker, (None, None) where it failed
+            or if camera calibration is not available
+        """
         cam_matrix = camera_matrix if camera_matrix is not None else self.camera_matrix
         dist_coeff = dist_coeffs if dist_coeffs is not None else self.dist_coeffs
         
         if cam_matrix is None:
             logger.warning("Camera calibration not available. Cannot estimate pose.")
-            return None, None
+            return [(None, None)] * len(corners)
         
         if dist_coeff is None:
-            dist_coeff = np.zeros((5, 1))
-        
-        # Object points for the marker (square with marker_size_cm dimensions)
-        marker_points = np.array([
-            [-self.marker_size_cm/2, self.marker_size_cm/2, 0],
-            [self.marker_size_cm/2, self.marker_size_cm/2, 0],
-            [self.marker_size_cm/2, -self.marker_size_cm/2, 0],
-            [-self.marker_size_cm/2, -self.marker_size_cm/2, 0]
-        ], dtype=np.float32)
-        
-        # Solve PnP to get pose
-        success, rvec, tvec = cv2.solvePnP(
-            marker_points,
-            corners,
-            cam_matrix,
-            dist_coeff,
-            flags=cv2.SOLVEPNP_IPPE_SQUARE
-        )
+            dist_coeff = self._zero_dist
         
-        if success:
-            return rvec, tvec
-        return None, None
+        poses = []
+        for corner in corners:
+            # Solve PnP to get pose (square with marker_size_cm dimensions)
+            success, rvec, tvec = cv2.solvePnP(
+                self._marker_points,
+                corner,
+                cam_matrix,
+                dist_coeff,
+                flags=cv2.SOLVEPNP_IPPE_SQUARE
+            )
+            poses.append((rvec, tvec) if success else (None, None))
+        return poses
     
     def draw_detections(
         self,
@@ -205,13 +522,12 @@ class ArucoDetector:
         # Draw marker boundaries
         cv2.aruco.drawDetectedMarkers(frame, corners, ids)
         
-        # Draw additional info for each marker
-        for i, corner in enumerate(corners):
-            # Get marker center
-            center = corner[0].mean(axis=0).astype(int)
-            
-            # Estimate distance
-            distance = self.estimate_distance(corner)
+        # Draw additional info for each marker (putText bound once for the loop)
+        put_text = cv2.putText
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        geometry = self._marker_geometry(corners)
+        for i, (distance, center_x, center_y, _) in enumerate(geometry):
+            center = (int(center_x), int(center_y))
             
             # Prepare text
             text_lines = []
@@ -223,11 +539,11 @@ class ArucoDetector:
             # Draw text
             y_offset = -10
             for text in text_lines:
-                cv2.putText(
+                put_text(
                     frame,
                     text,
                     (center[0], center[1] + y_offset),
-                    cv2.FONT_HERSHEY_SIMPLEX,
+                    font,
                     0.6,
                     (0, 255, 0),
                     2
@@ -254,29 +570,48 @@ class ArucoDetector:
         if ids is None or len(ids) == 0:
             return []
         
-        markers_info = []
+        geometry = self._marker_geometry(corners)
         
-        for i, corner in enumerate(corners):
-            marker_id = ids[i][0]
-            distance = self.estimate_distance(corner)
-            center = corner[0].mean(axis=0)
-            
-            # Calculate marker area (for quality assessment)
-            area = cv2.contourArea(corner[0])
-            
-            info = {
+        return [
+            {
                 'id': marker_id,
                 'distance_cm': distance,
-                'center_x': float(center[0]),
-                'center_y': float(center[1]),
+                'center_x': center_x,
+                'center_y': center_y,
                 'corners': corner[0].tolist(),
-                'area_px': float(area)
+                'area_px': area  # For quality assessment
             }
-            
-            markers_info.append(info)
+            for marker_id, corner, (distance, center_x, center_y, area)
+            in zip(ids[:, 0], corners, geometry)
+        ]
+    
+    def _marker_geometry(self, corners: List) -> List[Tuple[float, float, float, float]]:
+        """
+        Distance, center and area of every detected marker.
         
-        return markers_info
-
+        All edges, centers and diagonals come out of a single matrix product
+        over the stacked corners; only the square roots and cross products
+        are left per marker.
+        
+        Args:
+            corners: Detected marker corners, each of shape (1, 4, 2)
+        
+        Returns:
+            List of (distance_cm, center_x, center_y, area_px) per marker
+        """
+        rows = (np.concatenate(corners).reshape(-1, 8) @ _CORNER_GEOMETRY).tolist()
+        size_times_focal = self.marker_size_cm * self.focal_length_px
+        return [
+            (
+                # Same formula as estimate_distance (mean of top and bottom edge)
+                size_times_focal / ((math.hypot(tx, ty) + math.hypot(bx, by)) / 2.0),
+                cx,
+                cy,
+                # Half the diagonals' cross product: the area cv2.contourArea gives
+                0.5 * abs(d1x * d2y - d1y * d2x)
+            )
+            for tx, ty, bx, by, cx, cy, d1x, d1y, d2x, d2y in rows
+        ]
 
 def generate_aruco_marker(marker_id: int, marker_size: int = 200, aruco_dict_type: str = "DICT_6X6_250", border_bits: int = 1) -> np.ndarray:
     """
@@ -296,16 +631,14 @@ def generate_aruco_marker(marker_id: int, marker_size: int = 200, aruco_dict_typ
     
     aruco_dict = cv2.aruco.getPredefinedDictionary(ArucoDetector.ARUCO_DICT[aruco_dict_type])
     
-    # Generate marker without border first
-    marker_image = cv2.aruco.generateImageMarker(aruco_dict, marker_id, marker_size, borderBits=border_bits)
-    
-    # Add extra white padding for better detection
+    # Extra white padding for better detection: draw the marker straight into
+    # the center of a white canvas instead of padding a copy afterwards
     padding = max(20, marker_size // 10)
-    marker_with_padding = cv2.copyMakeBorder(
-        marker_image,
-        padding, padding, padding, padding,
-        cv2.BORDER_CONSTANT,
-        value=255
+    marker_with_padding = np.full((marker_size + 2 * padding,) * 2, 255, dtype=np.uint8)
+    cv2.aruco.generateImageMarker(
+        aruco_dict, marker_id, marker_size,
+        marker_with_padding[padding:padding + marker_size, padding:padding + marker_size],
+        border_bits
     )
     
     return marker_with_padding
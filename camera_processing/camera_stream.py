@@ -0,0 +1,399 @@
+"""
+MJPEG Camera Stream Client
+==========================
+
+This module reads an HTTP MJPEG stream (e.g. DroidCam) and decodes its frames.
+JPEG decoding uses libjpeg-turbo through PyTurboJPEG when it is installed and
+falls back to OpenCV otherwise. On NVIDIA machines with nvjpeg-python installed
+decoding can be moved to the GPU.
+"""
+
+import queue
+import threading
+import cv2
+import numpy as np
+import requests
+import urllib3
+from typing import Iterator, List, Optional
+import logging
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJFLAG_FASTDCT, TJFLAG_FASTUPSAMPLE
+except ImportError:
+    TurboJPEG = None
+
+try:
+    from nvjpeg import NvJpeg
+except ImportError:
+    NvJpeg = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# JPEG start/end of image markers
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+
+# Parser states: skipping part headers until an SOI, or inside a JPEG until its EOI
+IN_HEADERS = 0
+IN_JPEG = 1
+
+# Trim the buffer when this much data has arrived without a complete frame
+MAX_BUFFER_BYTES = 500_000
+
+# Shared libjpeg-turbo handle (loading the library is the expensive part);
+# False once loading has failed so it isn't retried on every reconnect
+_turbo_decoder = None
+
+
+def _get_turbojpeg():
+    """Return the process-wide TurboJPEG instance, or None if unavailable."""
+    global _turbo_decoder
+    if _turbo_decoder is None:
+        _turbo_decoder = False
+        if TurboJPEG is not None:
+            try:
+                _turbo_decoder = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"libjpeg-turbo not available, using OpenCV decoder: {e}")
+    return _turbo_decoder or None
+
+
+def _get_nvjpeg():
+    """Create an nvJPEG (GPU) decoder, or return None if unavailable."""
+    if NvJpeg is None:
+        logger.warning("nvjpeg-python not installed, using CPU decoder")
+        return None
+    try:
+        return NvJpeg()
+    except Exception as e:
+        logger.warning(f"nvJPEG not available, using CPU decoder: {e}")
+        return None
+
+
+class CameraStreamClient:
+    """
+    Client for HTTP MJPEG camera streams.
+
+    Frames are cut out of the multipart response by their JPEG SOI/EOI markers
+    and decoded to BGR numpy arrays.
+    """
+
+    def __init__(self, stream_url: str, timeout: float = 5.0, use_turbojpeg: bool = True,
+                 use_nvjpeg: bool = False, chunk_size: int = 32768,
+                 background_reader: bool = True):
+        """
+        Initialize the stream client.
+
+        Args:
+            stream_url: URL of the MJPEG stream (e.g. http://<ip>:4747/video)
+            timeout: Connect/read timeout in seconds
+            use_turbojpeg: Decode with PyTurboJPEG when available
+            use_nvjpeg: Decode on the GPU with nvJPEG when available
+                (takes precedence over PyTurboJPEG)
+            chunk_size: Maximum bytes per network read; a typical frame
+                arrives in one or two reads
+            background_reader: Read and parse the stream on a background
+                thread so get_frame() only waits for the newest frame
+        """
+        self.stream_url = stream_url
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.background_reader = background_reader
+
+        self.stream: Optional[requests.Response] = None
+        self._stream_iterator: Optional[Iterator[bytes]] = None
+        self._buffer = bytearray()  # Grown and trimmed in place
+        # Incremental parser: in IN_JPEG the buffer starts at the frame's SOI;
+        # _scan_pos is where the next marker search resumes
+        self._parse_state = IN_HEADERS
+        self._scan_pos = 0
+
+        self._latest_frame: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._last_jpeg: Optional[bytes] = None  # Grabbed but not yet decoded
+
+        # Background reader: newest complete JPEG (None = stream ended), drop-oldest
+        self._jpeg_q: queue.Queue = queue.Queue(maxsize=1)
+        self._reader_thread: Optional[threading.Thread] = None
+        self._stop_reader = threading.Event()
+
+        # One decoder instance is reused for every frame (and every client)
+        self._turbo = _get_turbojpeg() if use_turbojpeg else None
+        self._nvjpeg = _get_nvjpeg() if use_nvjpeg else None
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the HTTP stream is open."""
+        return self._stream_iterator is not None
+
+    def connect(self) -> bool:
+        """
+        Connect to the camera stream.
+
+        Returns:
+            True if the stream was opened
+        """
+        return self.start_stream()
+
+    def start_stream(self) -> bool:
+        """
+        Open the HTTP stream.
+
+        The multipart boundary is not parsed: frames are delimited by their
+        JPEG markers alone.
+
+        Returns:
+            True if the stream was opened
+        """
+        try:
+            self.stream = requests.get(self.stream_url, stream=True, timeout=self.timeout)
+            self.stream.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"Failed to connect to {self.stream_url}: {e}")
+            self.stream = None
+            return False
+
+        self._stream_iterator = self._iter_chunks()
+        self._clear_buffer()
+
+        if self.background_reader:
+            self._stop_reader.clear()
+            while not self._jpeg_q.empty():
+                self._jpeg_q.get_nowait()
+            self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+            self._reader_thread.start()
+        decoder = 'nvjpeg' if self._nvjpeg else 'turbojpeg' if self._turbo else 'opencv'
+        logger.info(f"Connected to {self.stream_url} (decoder: {decoder})")
+        return True
+
+    def get_frame(self) -> Optional[np.ndarray]:
+        """
+        Wait for the next complete JPEG and decode it.
+
+        Only the newest frame is decoded; frames that arrived since the last
+        call are dropped.
+
+        Returns:
+            BGR frame, or None if not connected, the stream ended or no frame
+            arrived within the timeout
+        """
+        jpg = self._next_jpeg()
+        if jpg is None:
+            return None
+
+        if self._reader_thread is None:
+            newer = self._extract_frame_from_buffer()
+            while newer is not None:
+                jpg = newer
+                newer = self._extract_frame_from_buffer()
+
+        frame = self._decode(jpg)
+        if frame is not None:
+            with self._lock:
+                self._latest_frame = frame
+        return frame
+
+    def grab(self) -> bool:
+        """
+        Advance to the next frame without decoding it.
+
+        Like cv2.VideoCapture.grab(): a consumer that samples the stream can
+        call grab() for every frame and retrieve() only for the frames it
+        uses, skipping the JPEG decode of the rest.
+
+        Returns:
+            True if a frame was grabbed
+        """
+        self._last_jpeg = self._next_jpeg()
+        return self._last_jpeg is not None
+
+    def retrieve(self) -> Optional[np.ndarray]:
+        """
+        Decode the most recently grabbed frame.
+
+        Returns:
+            BGR frame, or None if nothing was grabbed or it failed to decode
+        """
+        if self._last_jpeg is None:
+            return None
+        frame = self._decode(self._last_jpeg)
+        self._last_jpeg = None
+        if frame is not None:
+            with self._lock:
+                self._latest_frame = frame
+        return frame
+
+    def get_frames_batch(self, n: int) -> List[np.ndarray]:
+        """
+        Read the next n frames in order.
+
+        Meant for consumers that process frames in batches (e.g. offline
+        analysis or GPU decoding), where amortizing per-call overhead matters
+        more than latency. No frames are dropped unless the background reader
+        is running and gets ahead of the consumer.
+
+        Args:
+            n: Number of frames to read
+
+        Returns:
+            Decoded BGR frames (fewer than n if the stream ended)
+        """
+        jpgs = []
+        while len(jpgs) < n:
+            jpg = self._next_jpeg()
+            if jpg is None:
+                break
+            jpgs.append(jpg)
+
+        frames = [frame for frame in map(self._decode, jpgs) if frame is not None]
+        if frames:
+            with self._lock:
+                self._latest_frame = frames[-1]
+        return frames
+
+    def get_latest_frame(self) -> Optional[np.ndarray]:
+        """Return the last successfully decoded frame without reading the stream."""
+        with self._lock:
+            return self._latest_frame
+
+    def disconnect(self):
+        """Close the HTTP stream and stop the background reader."""
+        self._stop_reader.set()
+        if self.stream is not None:
+            self.stream.close()  # Unblocks a reader waiting on the socket
+        reader = self._reader_thread
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(timeout=1.0)
+            self._reader_thread = None
+        self.stream = None
+        self._stream_iterator = None
+        self._clear_buffer()
+
+    def _reader_loop(self):
+        """Parse JPEGs off the stream and publish only the newest one."""
+        while not self._stop_reader.is_set():
+            jpg = self._read_jpeg()
+            # Replace any frame the consumer has not picked up yet
+            try:
+                self._jpeg_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._jpeg_q.put_nowait(jpg)
+            if jpg is None:
+                break
+
+    def _next_jpeg(self) -> Optional[bytes]:
+        """Next JPEG from the background reader, or read it directly if there is none."""
+        if self._reader_thread is None:
+            return self._read_jpeg()
+        if self._stream_iterator is None and self._jpeg_q.empty():
+            return None
+        try:
+            return self._jpeg_q.get(timeout=self.timeout)
+        except queue.Empty:
+            return None
+
+    def _read_jpeg(self) -> Optional[bytes]:
+        """
+        Return the next complete JPEG, reading from the stream as needed.
+
+        Returns:
+            JPEG bytes, or None if not connected or the stream ended
+        """
+        if self._stream_iterator is None:
+            return None
+
+        try:
+            jpg = self._extract_frame_from_buffer()
+            while jpg is None:
+                self._buffer.extend(next(self._stream_iterator))
+                jpg = self._extract_frame_from_buffer()
+                if jpg is None and len(self._buffer) > MAX_BUFFER_BYTES:
+                    # No EOI in sight: give up on this frame and resync
+                    del self._buffer[:-100000]
+                    self._parse_state = IN_HEADERS
+                    self._scan_pos = 0
+        except (StopIteration, requests.RequestException, urllib3.exceptions.HTTPError,
+                OSError, ValueError, AttributeError) as e:
+            # OSError/ValueError/AttributeError: stream closed under a blocked read
+            if not self._stop_reader.is_set():
+                logger.warning(f"Camera stream ended: {e!r}")
+            self.disconnect()
+            return None
+        return jpg
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        """Yield stream data as soon as it arrives, up to chunk_size bytes at a time."""
+        raw = self.stream.raw
+        # MJPEG is never content-encoded; skip urllib3's decoder lookup per read
+        raw.decode_content = False
+        if not hasattr(raw, 'read1'):
+            # urllib3 < 2: fixed-size reads block until full, so keep them small
+            yield from self.stream.iter_content(chunk_size=1024)
+            return
+
+        while True:
+            chunk = raw.read1(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def _extract_frame_from_buffer(self) -> Optional[bytes]:
+        """
+        Advance the parser over newly buffered bytes.
+
+        Each byte is searched once: IN_HEADERS looks for an SOI and discards
+        everything before it, IN_JPEG looks for the matching EOI.
+
+        Returns:
+            JPEG bytes, or None if no complete frame is buffered yet
+        """
+        if self._parse_state == IN_HEADERS:
+            start = self._buffer.find(JPEG_SOI, self._scan_pos)
+            if start == -1:
+                # Keep the last byte: it may be the first half of a marker
+                del self._buffer[:-1]
+                self._scan_pos = 0
+                return None
+            del self._buffer[:start]
+            self._parse_state = IN_JPEG
+            self._scan_pos = 2
+
+        end = self._buffer.find(JPEG_EOI, self._scan_pos)
+        if end == -1:
+            self._scan_pos = max(2, len(self._buffer) - 1)
+            return None
+
+        self._parse_state = IN_HEADERS
+        self._scan_pos = 0
+        return self._pop_jpeg(end + 2)
+
+    def _clear_buffer(self):
+        """Drop buffered stream data and reset the parser."""
+        self._buffer.clear()
+        self._parse_state = IN_HEADERS
+        self._scan_pos = 0
+
+    def _pop_jpeg(self, end: int) -> bytes:
+        """Copy buffer[:end] out once and drop it from the buffer."""
+        with memoryview(self._buffer) as view:
+            jpg = bytes(view[:end])
+        del self._buffer[:end]
+        return jpg
+
+    def _decode(self, jpg: bytes) -> Optional[np.ndarray]:
+        """Decode JPEG bytes to a BGR frame (None if the data is corrupt)."""
+        if self._nvjpeg is not None:
+            frame = self._nvjpeg.decode(jpg)
+            return frame if isinstance(frame, np.ndarray) and frame.size else None
+        if self._turbo is not None:
+            try:
+                # Fast integer IDCT and chroma upsampling: visually identical
+                # for display/detection and noticeably cheaper per frame
+                return self._turbo.decode(jpg, pixel_format=TJPF_BGR,
+                                          flags=TJFLAG_FASTDCT | TJFLAG_FASTUPSAMPLE)
+            except OSError as e:
+                logger.debug(f"Dropping corrupt JPEG frame: {e}")
+                return None
+        return cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_COLOR)
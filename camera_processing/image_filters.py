@@ -7,6 +7,15 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Filter kernels, built once (float32 is the type filter2D uses internally)
+_SHARPEN_KERNEL = np.array([[-1, -1, -1],
+                            [-1,  9, -1],
+                            [-1, -1, -1]], dtype=np.float32)
+
+# CUDA filters are only present in OpenCV builds with the cudafilters module
+_CUDA_AVAILABLE = (hasattr(cv2, 'cuda') and hasattr(cv2.cuda, 'createGaussianFilter')
+                   and cv2.cuda.getCudaEnabledDeviceCount() > 0)
+
 
 class ProcessingMode(Enum):
     """Available image processing modes."""
@@ -26,50 +35,124 @@ class FrameProcessor:
     Multiple image filters and custom processing operations (No application right now on the project).
     """
 
-    def __init__(self):
-        """Initialize image filter processor."""
+    def __init__(self, use_opencl: Optional[bool] = None, gray_output: bool = False):
+        """
+        Initialize image filter processor.
+
+        Args:
+            use_opencl: Run the pipeline on cv2.UMat so OpenCV can use OpenCL
+                kernels. None enables it when an OpenCL device is available
+                and no CUDA device is (CUDA steps only take numpy frames).
+            gray_output: Return single-channel results (grayscale, edges,
+                threshold) as-is. Otherwise they are converted back to BGR
+                once, after the last step.
+        """
         self.processing_pipeline: List[Callable] = []
+        # Straight-line function generated from the pipeline, rebuilt on change
+        self._compiled: Optional[Callable] = None
         self.enabled = True
+        self.gray_output = gray_output
+
+        if use_opencl is None:
+            use_opencl = cv2.ocl.haveOpenCL() and not _CUDA_AVAILABLE
+        self.use_opencl = use_opencl
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+            logger.info("OpenCL enabled for frame processing")
 
     def add_processing_step(self, func: Callable[[np.ndarray], np.ndarray]):
         """
         Add a custom processing function to the pipeline.
 
         Args:
-            func: Function that takes a frame (numpy array) and returns processed frame
+            func: Function that takes a frame (numpy array) and returns processed frame.
+                Functions that draw on their input in place must set
+                ``func.modifies_input = True`` so the caller's frame is copied first.
         """
         self.processing_pipeline.append(func)
+        self._compiled = None
         logger.info(f"Added processing step: {func.__name__}")
 
     def clear_pipeline(self):
         """Clear all processing steps."""
         self.processing_pipeline.clear()
+        self._compiled = None
         logger.info("Processing pipeline cleared")
 
     def process(self, frame: np.ndarray) -> np.ndarray:
         """
         Process frame through the entire pipeline.
 
+        With OpenCL enabled the frame is uploaded once as a cv2.UMat, every
+        step runs on it, and the result is downloaded once at the end.
+        Steps may return single-channel frames; they are passed on as-is.
+        The input frame is only copied if an in-place step would otherwise
+        draw on it.
+
+        Note:
+            Steps write into output buffers they keep between calls, so the
+            returned array is usually the same object on every call and is
+            overwritten by the next one. Callers that keep a result across
+            calls (queues, frame history) must store ``result.copy()``.
+
         Args:
             frame: Input frame as numpy array (BGR format)
 
         Returns:
-            Processed frame
+            Processed frame, valid until the next call
         """
-        if not self.enabled or frame is None:
+        if not self.enabled or frame is None or not self.processing_pipeline:
             return frame
 
-        processed_frame = frame.copy()
+        source = cv2.UMat(frame) if self.use_opencl else frame
+
+        if self._compiled is None:
+            self._compiled = self._compile_pipeline()
+        try:
+            processed_frame = self._compiled(source, frame)
+        except Exception:
+            # Rerun step by step so the failing step is logged and skipped,
+            # and stay on that path until the pipeline changes
+            self._compiled = self._run_steps
+            processed_frame = self._run_steps(source, frame)
+
+        if isinstance(processed_frame, cv2.UMat):
+            processed_frame = processed_frame.get()
+        if processed_frame.ndim == 2 and not self.gray_output:
+            processed_frame = cv2.cvtColor(processed_frame, cv2.COLOR_GRAY2BGR)
+        return processed_frame
 
+    def _run_steps(self, processed_frame, frame: np.ndarray):
+        """Run the pipeline one step at a time, skipping steps that raise."""
         for step in self.processing_pipeline:
+            if processed_frame is frame and getattr(step, 'modifies_input', False):
+                processed_frame = frame.copy()
             try:
                 processed_frame = step(processed_frame)
             except Exception as e:
                 logger.error(f"Error in processing step {step.__name__}: {e}")
                 continue
-
         return processed_frame
 
+    def _compile_pipeline(self) -> Callable:
+        """
+        Generate one function that calls every step in sequence.
+
+        Equivalent to _run_steps without the loop, the per-step try/except
+        and the modifies_input lookups, which are resolved here once.
+        Adjacent steps that can share a pass are fused first (_fuse_steps).
+        """
+        namespace: Dict[str, Any] = {}
+        lines = ["def _pipeline(f, frame):"]
+        for i, step in enumerate(_fuse_steps(self.processing_pipeline)):
+            namespace[f"step{i}"] = step
+            if getattr(step, 'modifies_input', False):
+                lines.append("    if f is frame: f = frame.copy()")
+            lines.append(f"    f = step{i}(f)")
+        lines.append("    return f")
+        exec(compile("\n".join(lines), "<frame pipeline>", "exec"), namespace)
+        return namespace["_pipeline"]
+
     def enable(self):
         """Enable frame processing."""
         self.enabled = True
@@ -78,6 +161,78 @@ class FrameProcessor:
         """Disable frame processing (passthrough mode)."""
         self.enabled = False
 
+def _reuse_dst(buffers: Dict[str, np.ndarray], frame: np.ndarray,
+               shape: Optional[tuple] = None) -> Optional[np.ndarray]:
+    """
+    Return the step's cached uint8 output buffer, reallocated if the shape changed.
+
+    Returns None for cv2.UMat input so OpenCV allocates on the device instead.
+    """
+    if not isinstance(frame, np.ndarray):
+        return None
+    if shape is None:
+        shape = frame.shape
+    dst = buffers.get('dst')
+    if dst is None or dst.shape != shape:
+        dst = buffers['dst'] = np.empty(shape, dtype=np.uint8)
+    return dst
+
+
+def _lut_step(lut: np.ndarray, name: str) -> Callable:
+    """Create a step applying a 256-entry uint8 lookup table to every channel."""
+    buffers: Dict[str, np.ndarray] = {}
+
+    def _lut(frame: np.ndarray) -> np.ndarray:
+        return cv2.LUT(frame, lut, dst=_reuse_dst(buffers, frame))
+    _lut.__name__ = name
+    _lut.lut = lut
+    _lut._fusion_id = 'lut'
+    return _lut
+
+
+def _cuda_step(make_filter: Callable[[int], Callable], cpu_step: Callable) -> Callable:
+    """
+    Wrap a CPU step so numpy frames run through a cv2.cuda filter instead.
+
+    Args:
+        make_filter: Builds the GPU operation for an OpenCV frame type, as a
+            callable (gpu_src, gpu_dst) -> None. Frame types it cannot handle
+            (cv2.error) stay on cpu_step.
+        cpu_step: Step used for cv2.UMat input and unsupported frame types
+
+    Returns:
+        Processing function
+    """
+    filters: Dict[int, Optional[Callable]] = {}
+    gpu_src = cv2.cuda_GpuMat()
+    gpu_dst = cv2.cuda_GpuMat()
+    buffers: Dict[str, np.ndarray] = {}
+
+    def _cuda(frame: np.ndarray) -> np.ndarray:
+        if not isinstance(frame, np.ndarray) or frame.dtype != np.uint8:
+            return cpu_step(frame)
+        frame_type = cv2.CV_8UC(1 if frame.ndim == 2 else frame.shape[2])
+        if frame_type not in filters:
+            try:
+                filters[frame_type] = make_filter(frame_type)
+            except cv2.error as e:
+                logger.warning(f"No CUDA filter for frame type {frame_type}: {e}")
+                filters[frame_type] = None
+        gpu_filter = filters[frame_type]
+        if gpu_filter is None:
+            return cpu_step(frame)
+
+        gpu_src.upload(frame)
+        gpu_filter(gpu_src, gpu_dst)
+        width, height = gpu_dst.size()
+        channels = gpu_dst.channels()
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        return gpu_dst.download(_reuse_dst(buffers, frame, shape))
+    _cuda.__name__ = cpu_step.__name__
+    _cuda._fusion_id = getattr(cpu_step, '_fusion_id', None)
+    return _cuda
+
+
 def resize_frame(width: int, height: int) -> Callable:
     """
     Create a resize processing function.
@@ -89,15 +244,30 @@ def resize_frame(width: int, height: int) -> Callable:
     Returns:
         Processing function
     """
+    buffers: Dict[str, np.ndarray] = {}
+
     def _resize(frame: np.ndarray) -> np.ndarray:
-        return cv2.resize(frame, (width, height), interpolation=cv2.INTER_LINEAR)
+        dst = _reuse_dst(buffers, frame, (height, width) + frame.shape[2:]
+                         if isinstance(frame, np.ndarray) else None)
+        return cv2.resize(frame, (width, height), dst=dst, interpolation=cv2.INTER_LINEAR)
     return _resize
 
 
+def _to_gray(frame: np.ndarray) -> np.ndarray:
+    """Return a single-channel version of a BGR or already-grayscale frame."""
+    if isinstance(frame, np.ndarray):
+        return frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    # cv2.UMat does not expose its channel count
+    try:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    except cv2.error:
+        return frame
+
+
 def convert_to_grayscale(frame: np.ndarray) -> np.ndarray:
-    """Convert frame to grayscale."""
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)  # Convert back to BGR for consistency
+    """Convert frame to grayscale (single channel)."""
+    return _to_gray(frame)
+convert_to_grayscale._fusion_id = 'grayscale'
 
 def apply_edge_detection(frame: np.ndarray, threshold1: int = 100, threshold2: int = 200) -> np.ndarray:
     """
@@ -109,11 +279,9 @@ def apply_edge_detection(frame: np.ndarray, threshold1: int = 100, threshold2: i
         threshold2: Second threshold for the hysteresis procedure
 
     Returns:
-        Edge-detected frame
+        Edge map (single channel)
     """
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, threshold1, threshold2)
-    return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+    return cv2.Canny(_to_gray(frame), threshold1, threshold2)
 
 
 def apply_gaussian_blur(ksize: int = 5) -> Callable:
@@ -126,17 +294,44 @@ def apply_gaussian_blur(ksize: int = 5) -> Callable:
     Returns:
         Processing function
     """
+    buffers: Dict[str, np.ndarray] = {}
+
     def _blur(frame: np.ndarray) -> np.ndarray:
-        return cv2.GaussianBlur(frame, (ksize, ksize), 0)
+        return cv2.GaussianBlur(frame, (ksize, ksize), 0, dst=_reuse_dst(buffers, frame))
+
+    if _CUDA_AVAILABLE:
+        def _make_filter(frame_type: int) -> Callable:
+            gaussian = cv2.cuda.createGaussianFilter(frame_type, frame_type, (ksize, ksize), 0)
+            return gaussian.apply
+        return _cuda_step(_make_filter, _blur)
     return _blur
 
 
 def apply_sharpen(frame: np.ndarray) -> np.ndarray:
     """Apply sharpening filter."""
-    kernel = np.array([[-1, -1, -1],
-                       [-1,  9, -1],
-                       [-1, -1, -1]])
-    return cv2.filter2D(frame, -1, kernel)
+    return cv2.filter2D(frame, -1, _SHARPEN_KERNEL)
+
+
+def _cuda_sharpen_filter(frame_type: int) -> Callable:
+    """Build the GPU sharpen filter for a frame type (see _cuda_step)."""
+    return cv2.cuda.createLinearFilter(frame_type, frame_type, _SHARPEN_KERNEL).apply
+
+
+def _cuda_canny_filter(threshold1: int, threshold2: int) -> Callable[[int], Callable]:
+    """Return a _cuda_step filter factory running Canny on the GPU."""
+    def _make_filter(frame_type: int) -> Callable:
+        detector = cv2.cuda.createCannyEdgeDetector(threshold1, threshold2)
+        if frame_type == cv2.CV_8UC1:
+            return detector.detect
+        if frame_type != cv2.CV_8UC3:
+            raise cv2.error(f"unsupported frame type {frame_type}")
+        gray = cv2.cuda_GpuMat()
+
+        def _detect(src, dst):
+            cv2.cuda.cvtColor(src, cv2.COLOR_BGR2GRAY, gray)
+            detector.detect(gray, dst)
+        return _detect
+    return _make_filter
 
 
 def adjust_brightness(value: int = 30) -> Callable:
@@ -149,13 +344,27 @@ def adjust_brightness(value: int = 30) -> Callable:
     Returns:
         Processing function
     """
+    # Saturated add on HSV V as a 3-channel table (H and S map to themselves),
+    # replacing the split / add / merge passes
+    v_lut = np.clip(np.arange(256) + value, 0, 255).astype(np.uint8)
+    identity = np.arange(256, dtype=np.uint8)
+    hsv_lut = np.dstack((identity, identity, v_lut))
+    buffers: Dict[str, np.ndarray] = {}
+
     def _brightness(frame: np.ndarray) -> np.ndarray:
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        h, s, v = cv2.split(hsv)
-        v = cv2.add(v, value)
-        v = np.clip(v, 0, 255)
-        final_hsv = cv2.merge((h, s, v))
-        return cv2.cvtColor(final_hsv, cv2.COLOR_HSV2BGR)
+        if isinstance(frame, np.ndarray):
+            if frame.ndim == 2:
+                # Grayscale: value channel is the frame itself
+                return cv2.LUT(frame, v_lut, dst=_reuse_dst(buffers, frame))
+            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        else:
+            # cv2.UMat does not expose its channel count
+            try:
+                hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+            except cv2.error:
+                return cv2.LUT(frame, v_lut)
+        hsv = cv2.LUT(hsv, hsv_lut, dst=hsv if isinstance(hsv, np.ndarray) else None)
+        return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=_reuse_dst(buffers, frame))
     return _brightness
 
 
@@ -169,11 +378,39 @@ def adjust_contrast(alpha: float = 1.5) -> Callable:
     Returns:
         Processing function
     """
+    buffers: Dict[str, np.ndarray] = {}
+
     def _contrast(frame: np.ndarray) -> np.ndarray:
-        return cv2.convertScaleAbs(frame, alpha=alpha, beta=0)
+        return cv2.convertScaleAbs(frame, dst=_reuse_dst(buffers, frame), alpha=alpha, beta=0)
+    # Same mapping as a table (float32, as convertScaleAbs computes it), so it
+    # can be folded into neighbouring LUT steps
+    scaled = np.float32(alpha) * np.arange(256, dtype=np.float32)
+    _contrast.lut = np.clip(np.rint(np.abs(scaled)), 0, 255).astype(np.uint8)
+    _contrast._fusion_id = 'lut'
     return _contrast
 
 
+def adjust_brightness_contrast(alpha: float = 1.5, beta: int = 30) -> Callable:
+    """
+    Create a combined contrast and brightness adjustment function.
+
+    Computes alpha * frame + beta (saturated) on each BGR channel in a single
+    lookup-table pass. Unlike adjust_brightness, beta is not applied to HSV V,
+    so saturated colors brighten differently.
+
+    Args:
+        alpha: Contrast control (1.0-3.0, 1.0 is no change)
+        beta: Brightness adjustment value (-100 to 100)
+
+    Returns:
+        Processing function
+    """
+    # Not convertScaleAbs: it takes |alpha * x + beta|, which brightens dark
+    # pixels when beta is negative
+    lut = np.clip(np.rint(alpha * np.arange(256) + beta), 0, 255).astype(np.uint8)
+    return _lut_step(lut, '_brightness_contrast')
+
+
 def apply_threshold(thresh_value: int = 127) -> Callable:
     """
     Create a binary threshold processing function.
@@ -184,10 +421,14 @@ def apply_threshold(thresh_value: int = 127) -> Callable:
     Returns:
         Processing function
     """
+    buffers: Dict[str, np.ndarray] = {}
+
     def _threshold(frame: np.ndarray) -> np.ndarray:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, thresh_value, 255, cv2.THRESH_BINARY)
-        return cv2.cvtColor(thresh, cv2.COLOR_GRAY2BGR)
+        gray = _to_gray(frame)
+        _, thresh = cv2.threshold(gray, thresh_value, 255, cv2.THRESH_BINARY,
+                                  dst=_reuse_dst(buffers, gray))
+        return thresh
+    _threshold._fusion_id = 'to_gray'
     return _threshold
 
 def add_timestamp(frame: np.ndarray) -> np.ndarray:
@@ -198,6 +439,9 @@ def add_timestamp(frame: np.ndarray) -> np.ndarray:
                 0.7, (0, 255, 0), 2, cv2.LINE_AA)
     return frame
 
+
+add_timestamp.modifies_input = True
+
 def add_text_overlay(text: str, position: tuple = (10, 30),
                      color: tuple = (0, 255, 0), thickness: int = 2) -> Callable:
     """
@@ -216,24 +460,54 @@ def add_text_overlay(text: str, position: tuple = (10, 30),
         cv2.putText(frame, text, position, cv2.FONT_HERSHEY_SIMPLEX,
                    0.7, color, thickness, cv2.LINE_AA)
         return frame
+    _overlay.modifies_input = True
     return _overlay
 
 
+def _fuse_steps(steps: List[Callable]) -> List[Callable]:
+    """
+    Merge adjacent pipeline steps that can share one pass over the frame.
+
+    Steps are matched by their ``_fusion_id`` tag:
+        - 'grayscale' followed by a step that converts to gray itself
+          ('grayscale' or 'to_gray') is dropped
+        - consecutive 'lut' steps are composed into a single table lookup
+
+    Returns:
+        New list of steps; the input list is not modified
+    """
+    fused: List[Callable] = []
+    for step in steps:
+        prev_id = getattr(fused[-1], '_fusion_id', None) if fused else None
+        step_id = getattr(step, '_fusion_id', None)
+        if prev_id == 'grayscale' and step_id in ('grayscale', 'to_gray'):
+            fused[-1] = step
+        elif prev_id == 'lut' and step_id == 'lut':
+            prev = fused[-1]
+            fused[-1] = _lut_step(step.lut[prev.lut],
+                                  f"{prev.__name__}+{step.__name__}")
+        else:
+            fused.append(step)
+    return fused
+
+
 # Factory function to create processor with preset modes
 
 def create_processor(mode: ProcessingMode = ProcessingMode.ORIGINAL,
-                     **kwargs) -> FrameProcessor:
+                     gray_output: bool = False, **kwargs) -> FrameProcessor:
     """
     Create a frame processor with a preset processing mode.
 
     Args:
         mode: Processing mode to apply
+        gray_output: Return single-channel results without converting to BGR
+            (for consumers that display grayscale natively)
         **kwargs: Additional parameters for specific modes
 
     Returns:
         Configured FrameProcessor instance
     """
-    processor = FrameProcessor()
+    processor = FrameProcessor(gray_output=gray_output)
 
     if mode == ProcessingMode.ORIGINAL:
         pass  # No processing
@@ -244,16 +518,20 @@ def create_processor(mode: ProcessingMode = ProcessingMode.ORIGINAL,
     elif mode == ProcessingMode.EDGE_DETECTION:
         threshold1 = kwargs.get('threshold1', 100)
         threshold2 = kwargs.get('threshold2', 200)
-        processor.add_processing_step(
-            lambda frame: apply_edge_detection(frame, threshold1, threshold2)
-        )
+        edges = lambda frame: apply_edge_detection(frame, threshold1, threshold2)
+        edges._fusion_id = 'to_gray'
+        if _CUDA_AVAILABLE:
+            edges = _cuda_step(_cuda_canny_filter(threshold1, threshold2), edges)
+        processor.add_processing_step(edges)
 
     elif mode == ProcessingMode.BLUR:
         ksize = kwargs.get('ksize', 5)
         processor.add_processing_step(apply_gaussian_blur(ksize))
 
     elif mode == ProcessingMode.SHARPEN:
-        processor.add_processing_step(apply_sharpen)
+        processor.add_processing_step(
+            _cuda_step(_cuda_sharpen_filter, apply_sharpen) if _CUDA_AVAILABLE else apply_sharpen
+        )
 
     elif mode == ProcessingMode.BRIGHTNESS:
         value = kwargs.get('value', 30)
@@ -20,14 +20,32 @@ Controls:
 - WASD - Manual control (when in manual mode)
 """
 
+import os
+
+# Leave one core for the capture/BLE threads. Must be set before cv2 is imported,
+# some OpenCV builds read it only when their OpenMP runtime starts.
+_DETECTION_THREADS = max(1, (os.cpu_count() or 2) - 1)
+os.environ.setdefault("OMP_NUM_THREADS", str(_DETECTION_THREADS))
+
 import cv2
 import sys
-import os
 import yaml
 import time
+import queue
 import asyncio
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing import shared_memory, util
+import numpy as np
 from bleak import BleakScanner, BleakClient
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # Add parent directory to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -35,16 +53,89 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from camera_processing import ArucoDetector
+from navigation.base_navigation import (
+    _CHANNEL_SUM, BleCommandMixin, FrameGrabberMixin, open_capture
+)
+
 
+# Per-process state for detection workers
+_worker_detector = None
+_worker_shm = {}
 
-def to_byte(val):
-    """Convert value from -1.0 to +1.0 to byte (0-255)."""
-    return int((val + 1) * 127.5)
 
+def _init_detect_worker(detector_kwargs):
+    """Build the ArUco detector once per worker process."""
+    global _worker_detector
+    cv2.setNumThreads(1)  # Parallelism comes from the pool, avoid oversubscription
+    _worker_detector = ArucoDetector(**detector_kwargs)
+    # Runs when the worker exits after Pool.close()
+    util.Finalize(None, _close_worker_shm, exitpriority=10)
+
+
+def _close_worker_shm(max_size=None):
+    """Close the worker's cached shared-memory attachments (those smaller than max_size)."""
+    for name, shm in list(_worker_shm.items()):
+        if max_size is None or shm.size < max_size:
+            shm.close()
+            del _worker_shm[name]
+
+
+def _detect_worker(shm_name, shape):
+    """
+    Detect markers in a frame stored in shared memory.
+    
+    Returns:
+        (corners, ids) - small arrays, cheap to pickle back
+    """
+    shm = _worker_shm.get(shm_name)
+    if shm is None:
+        # New slots are only created when frames outgrow the old ones,
+        # so any smaller attachment belongs to a freed slot
+        _close_worker_shm(int(np.prod(shape)))
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_shm[shm_name] = shm
+    frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    corners, ids, _ = _worker_detector.detect(frame)
+    return corners, ids
 
-class ArucoNavigationController:
+
+class ArucoNavigationController(FrameGrabberMixin, BleCommandMixin):
     """Controller for ArUco-based autonomous navigation via BLE."""
     
+    # Fixed attribute set: slot descriptors instead of a per-instance __dict__
+    # for the config/state values read on every frame
+    __slots__ = (
+        # Config and camera
+        'config', 'camera_url', 'cap',
+        # Detection
+        'detector_kwargs', 'detector', 'detection_workers', 'control_period',
+        '_det_ewma', '_skip_frames', '_last_corners', '_last_ids',
+        '_pool', '_shm_slots', '_next_slot', '_in_flight',
+        # Navigation parameters
+        'target_distance_cm', '_target_text', 'distance_tolerance_cm',
+        'max_steering', '_max_steering', 'steering_kp', 'base_throttle',
+        'backward_throttle_multiplier', 'steering_dead_zone', 'steering_quantization',
+        # BLE
+        'ble_device_name', 'ble_service_uuid', 'ble_throttle_uuid',
+        'ble_steering_uuid', 'ble_command_uuid', 'ble_client',
+        'pending_ble_task', 'ble_command_char', 'ble_throttle_char', 'ble_steering_char',
+        # State
+        'autonomous_mode', 'manual_mode', 'running',
+        'frame_width', 'frame_height', '_frame_center',
+        '_anchor_mode_label', '_center_line_p1', '_center_line_p2',
+        'manual_throttle', 'manual_steering', 'current_throttle', 'current_steering', '_latest_cmd',
+        # Overlay, capture and display threads
+        '_overlay', '_overlay_mask', '_overlay_ttl',
+        '_latest_frame', '_capture_failed', '_frame_lock', '_frame_wanted', '_frame_event', '_loop',
+        '_cap_thread', '_threaded_display', '_display_q', '_key_q', '_display_thread',
+    )
+    
+    # Status text is rasterized once per this many frames and blitted in between
+    OVERLAY_REFRESH_FRAMES = 5
+    
+    # Single-stroke font, 1px strokes, no anti-aliasing: cheapest glyphs to rasterize
+    OVERLAY_FONT = cv2.FONT_HERSHEY_PLAIN
+    
     def __init__(self, config_path=None):
         """Initialize the navigation controller."""
         if config_path is None:
@@ -58,21 +149,48 @@ class ArucoNavigationController:
         aruco_cfg = self.config['aruco']
         nav_cfg = self.config.get('navigation', {})
         
+        # OpenCV's default thread count depends on the environment (1 in some containers)
+        cv2.setNumThreads(_DETECTION_THREADS)
+        
         # Camera setup
         self.camera_url = camera_cfg['url']
         self.cap = None
         
         # ArUco detector
-        self.detector = ArucoDetector(
-            aruco_dict_type=aruco_cfg['dictionary_type'],
-            marker_size_cm=aruco_cfg['marker_size_cm'],
-            focal_length_px=aruco_cfg['focal_length_px']
-        )
+        self.detector_kwargs = {
+            'aruco_dict_type': aruco_cfg['dictionary_type'],
+            'marker_size_cm': aruco_cfg['marker_size_cm'],
+            'focal_length_px': aruco_cfg['focal_length_px'],
+            'roi_detection': aruco_cfg.get('roi_detection', False),
+            'corner_refinement': aruco_cfg.get('corner_refinement', True),
+            'backend': aruco_cfg.get('backend', 'opencv'),
+            'detection_scale': aruco_cfg.get('detection_scale', 1.0),
+            'min_marker_perimeter_rate': aruco_cfg.get('min_marker_perimeter_rate', 0.03)
+        }
+        self.detector = ArucoDetector(**self.detector_kwargs)
+        
+        # Optional detection worker pool (0 = detect inline on the main thread).
+        # Frames go through shared memory; at most one slot per worker is in flight.
+        self.detection_workers = nav_cfg.get('detection_workers', 0)
+        self._pool = None
+        self._shm_slots = []
+        self._next_slot = 0
+        self._in_flight = deque()
+        
+        # Inline detection: skip frames (reusing the last result) while the
+        # average detection time would not fit in the control period
+        self.control_period = 1.0 / nav_cfg.get('control_rate_hz', 20.0)
+        self._det_ewma = 0.02
+        self._skip_frames = 0
+        self._last_corners = ()
+        self._last_ids = None
         
         # Navigation parameters
         self.target_distance_cm = nav_cfg.get('target_distance_cm', 25.0)
+        self._target_text = f"Target: {self.target_distance_cm:.1f}cm"  # Static overlay line
         self.distance_tolerance_cm = nav_cfg.get('distance_tolerance_cm', 3.0)
         self.max_steering = nav_cfg.get('max_steering', 0.6)
+        self._max_steering = float(self.max_steering)
         self.steering_kp = nav_cfg.get('steering_kp', 0.003)
         self.base_throttle = nav_cfg.get('base_throttle', 0.3)
         self.backward_throttle_multiplier = nav_cfg.get('backward_throttle_multiplier', 0.5)
@@ -87,6 +205,7 @@ class ArucoNavigationController:
         self.ble_service_uuid = ble_cfg.get('service_uuid', '12345678-1234-5678-1234-56789abcdef0')
         self.ble_throttle_uuid = ble_cfg.get('char_throttle_uuid', '12345678-1234-5678-1234-56789abcdef2')
         self.ble_steering_uuid = ble_cfg.get('char_steering_uuid', '12345678-1234-5678-1234-56789abcdef3')
+        self.ble_command_uuid = ble_cfg.get('char_command_uuid', '12345678-1234-5678-1234-56789abcdef4')
         
         # State
         self.autonomous_mode = True
@@ -94,18 +213,40 @@ class ArucoNavigationController:
         self.running = True
         self.frame_width = None
         self.frame_height = None
+        self._frame_center = None  # Cached frame_width / 2, set in init_camera
+        # Fixed overlay positions, set with the frame size
+        self._anchor_mode_label = None
+        self._center_line_p1 = None
+        self._center_line_p2 = None
         
         # BLE client
         self.ble_client = None
         self.pending_ble_task = None
+        self.ble_command_char = None  # Combined throttle+steering characteristic, if supported
+        self.ble_throttle_char = None
+        self.ble_steering_char = None
         
         # Manual control state
         self.manual_throttle = 0.0
         self.manual_steering = 0.0
         
         # Current commands
-        self.current_throttle = 0.0
-        self.current_steering = 0.0
+        self._init_commands()
+        
+        # Status overlay layer, re-rendered every OVERLAY_REFRESH_FRAMES frames
+        self._overlay = None
+        self._overlay_mask = None
+        self._overlay_ttl = 0
+        
+        # Grabber thread: grabs continuously, decodes only when a frame is wanted
+        self._init_grabber()
+        
+        # Display thread owns the HighGUI window; keypresses come back via _key_q.
+        # macOS (Cocoa) only allows HighGUI on the main thread, so display inline there
+        self._threaded_display = sys.platform != 'darwin'
+        self._display_q = queue.Queue(maxsize=1)
+        self._key_q = queue.Queue()
+        self._display_thread = None
         
     def load_config(self, config_path):
         """Load configuration from YAML file."""
@@ -115,7 +256,7 @@ class ArucoNavigationController:
         
         try:
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
             print(f"Loaded configuration from: {config_path}")
             return config
         except Exception as e:
@@ -137,7 +278,8 @@ class ArucoNavigationController:
                     'device_name': 'BLE_Sensor_Hub',
                     'service_uuid': '12345678-1234-5678-1234-56789abcdef0',
                     'char_throttle_uuid': '12345678-1234-5678-1234-56789abcdef2',
-                    'char_steering_uuid': '12345678-1234-5678-1234-56789abcdef3'
+                    'char_steering_uuid': '12345678-1234-5678-1234-56789abcdef3',
+                    'char_command_uuid': '12345678-1234-5678-1234-56789abcdef4'
                 }
             }
         }
@@ -145,8 +287,8 @@ class ArucoNavigationController:
     async def connect_ble(self):
         """Connect to BLE sensor hub."""
         print(f"\nScanning for BLE device '{self.ble_device_name}'...")
-        devices = await BleakScanner.discover(timeout=10.0) 
-        target_device = next((d for d in devices if d.name == self.ble_device_name), None)
+        # Returns as soon as the device advertises instead of always scanning 10 s
+        target_device = await BleakScanner.find_device_by_name(self.ble_device_name, timeout=10.0)
         
         if not target_device:
             print(f"ERROR: BLE device '{self.ble_device_name}' not found!")
@@ -163,13 +305,40 @@ class ArucoNavigationController:
             print("ERROR: Failed to connect to BLE device")
             return False
         
+        # Look the characteristics up once instead of by UUID on every write.
+        # The combined 2-byte command characteristic is only on newer firmware.
+        services = self.ble_client.services
+        self.ble_command_char = services.get_characteristic(self.ble_command_uuid)
+        self.ble_throttle_char = services.get_characteristic(self.ble_throttle_uuid) or self.ble_throttle_uuid
+        self.ble_steering_char = services.get_characteristic(self.ble_steering_uuid) or self.ble_steering_uuid
+        if self.ble_command_char is not None:
+            print("Using combined throttle+steering characteristic")
+        else:
+            print("Combined characteristic not found, using separate throttle/steering writes")
+        
         print("Connected successfully!\n")
         return True
     
+    def _set_frame_geometry(self, frame):
+        """Store the frame size and the overlay anchor points derived from it."""
+        self.frame_height, self.frame_width = frame.shape[:2]
+        self._frame_center = self.frame_width * 0.5
+        half_w = self.frame_width // 2
+        self._anchor_mode_label = (10, self.frame_height - 20)
+        self._center_line_p1 = (half_w, 0)
+        self._center_line_p2 = (half_w, self.frame_height)
+    
     def init_camera(self):
         """Initialize camera connection."""
         print(f"Connecting to camera at {self.camera_url}...")
-        self.cap = cv2.VideoCapture(self.camera_url)
+        
+        # Stop FFmpeg from pre-buffering the network stream (lower latency).
+        # Must be set before the capture is opened; an existing value is respected.
+        os.environ.setdefault(
+            "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+            "fflags;nobuffer|flags;low_delay|max_delay;0|reorder_queue_size;0"
+        )
+        self.cap = open_capture(self.camera_url, self.config['camera'].get('hw_acceleration', True))
         
         if not self.cap.isOpened():
             print(f"ERROR: Failed to connect to camera")
@@ -181,52 +350,147 @@ class ArucoNavigationController:
         # Get frame dimensions
         ret, frame = self.cap.read()
         if ret:
-            self.frame_height, self.frame_width = frame.shape[:2]
+            self._set_frame_geometry(frame)
             print(f"Camera connected: {self.frame_width}x{self.frame_height}")
         
         print("Camera connected successfully")
         return True
     
-    async def _ble_sender_task(self):
-        """Dedicated background task for sending BLE commands at 4Hz (250ms)."""
-        last_throttle_byte = None
-        last_steering_byte = None
+    def _start_detection_pool(self):
+        """Start the detection worker pool (before any other threads are running)."""
+        if self.detection_workers <= 0:
+            return
+        ctx = multiprocessing.get_context('spawn')
+        self._pool = ctx.Pool(
+            processes=self.detection_workers,
+            initializer=_init_detect_worker,
+            initargs=(self.detector_kwargs,)
+        )
+        print(f"Detection running on {self.detection_workers} worker processes")
+    
+    def _stop_detection_pool(self):
+        """Stop the worker pool and free the shared frame buffers."""
+        if self._pool is not None:
+            # Drain queued detections so no worker is still reading a slot, then
+            # let the workers exit normally so they close their attachments
+            for _, result in self._in_flight:
+                result.wait(timeout=1.0)
+            if all(result.ready() for _, result in self._in_flight):
+                self._pool.close()
+            else:
+                self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._in_flight.clear()
+        self._free_shm_slots()
+    
+    def _free_shm_slots(self):
+        """Close and unlink the shared frame buffers (nothing may be in flight)."""
+        for shm in self._shm_slots:
+            shm.close()
+            shm.unlink()
+        self._shm_slots = []
+    
+    async def _wait_for_detection(self, loop, frame):
+        """
+        Wait, off the event loop, for the pool results detect_markers(frame) needs.
         
-        while self.running:
-            try:
-                if self.ble_client and self.ble_client.is_connected:
-                    throttle_byte = to_byte(self.current_throttle)
-                    steering_byte = to_byte(self.current_steering)
-                    
-                    # Only send if values changed to avoid spamming ESP32
-                    if throttle_byte != last_throttle_byte or steering_byte != last_steering_byte:
-                        await self.ble_client.write_gatt_char(self.ble_throttle_uuid, bytearray([throttle_byte]))
-                        await self.ble_client.write_gatt_char(self.ble_steering_uuid, bytearray([steering_byte]))
-                        print(f"[BLE TX] Throttle: {self.current_throttle:+.2f} ({throttle_byte:3d}) | Steering: {self.current_steering:+.2f} ({steering_byte:3d})")
-                        last_throttle_byte = throttle_byte
-                        last_steering_byte = steering_byte
-                
-                # Send at 4Hz (250ms interval) - gentler on ESP32
-                await asyncio.sleep(0.25)
-            except Exception as e:
-                print(f"[BLE sender error: {e}]")
-                await asyncio.sleep(0.5)
+        That is the oldest in-flight result once the pipeline is full, or every
+        in-flight result when the frame outgrows the shared-memory slots.
+        """
+        if self._pool is None or not self._in_flight:
+            return
+        if self._shm_slots[0].size < frame.nbytes:
+            pending = [result for _, result in self._in_flight]
+        elif len(self._in_flight) >= len(self._shm_slots) - 1:
+            pending = [self._in_flight[0][1]]
+        else:
+            return
+        for result in pending:
+            if not result.ready():
+                await loop.run_in_executor(None, result.wait)
     
-    def send_motor_command(self, throttle, steering):
+    def detect_markers(self, frame):
         """
-        Update motor command values (non-blocking).
-        Background task handles actual BLE transmission.
+        Detect markers, pipelined through the worker pool when enabled.
         
-        Args:
-            throttle: -1.0 to +1.0
-            steering: -1.0 to +1.0
+        With workers, the frame is queued and the result of the oldest
+        in-flight frame is returned, so detection overlaps with capture and BLE.
+        Without workers, slow detection is run only on every few frames and the
+        previous result is reused in between.
+        
+        Returns:
+            (frame, corners, ids) for the frame the result belongs to,
+            or None while the pipeline is still filling
         """
-        # Clamp and store values - background task will send them
-        self.current_throttle = max(-1.0, min(1.0, throttle))
-        self.current_steering = max(-1.0, min(1.0, steering))
+        if self._pool is None:
+            if self._skip_frames > 0:
+                self._skip_frames -= 1
+                return frame, self._last_corners, self._last_ids
+            
+            t0 = time.perf_counter()
+            corners, ids, _ = self.detector.detect(frame)
+            self._det_ewma += 0.2 * (time.perf_counter() - t0 - self._det_ewma)
+            
+            # Detect on 1 of every (n + 1) frames so the average cost stays in budget
+            budget = 0.8 * self.control_period
+            if self._det_ewma > budget:
+                self._skip_frames = int(self._det_ewma / budget)
+            
+            self._last_corners, self._last_ids = corners, ids
+            return frame, corners, ids
+        
+        # One shared-memory slot per worker, and at least two so the result
+        # returned is for an earlier frame (_wait_for_detection can await it
+        # first). The slot being written is never in flight.
+        if not self._shm_slots or self._shm_slots[0].size < frame.nbytes:
+            # Results computed for the old slots are still returned in order
+            for _, result in self._in_flight:
+                result.wait()
+            self._free_shm_slots()
+            self._shm_slots = [shared_memory.SharedMemory(create=True, size=frame.nbytes)
+                               for _ in range(max(2, self.detection_workers))]
+        
+        shm = self._shm_slots[self._next_slot]
+        self._next_slot = (self._next_slot + 1) % len(self._shm_slots)
+        np.ndarray(frame.shape, dtype=np.uint8, buffer=shm.buf)[:] = frame
+        result = self._pool.apply_async(_detect_worker, (shm.name, frame.shape))
+        self._in_flight.append((frame, result))
+        
+        if len(self._in_flight) < len(self._shm_slots):
+            return None
+        
+        old_frame, old_result = self._in_flight.popleft()
+        corners, ids = old_result.get()
+        return old_frame, corners, ids
+    
+    def _open_window(self, window_name):
+        """Create the display window (from the thread that will draw into it)."""
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, 1280, 720)
+    
+    def _display_loop(self, window_name):
+        """
+        Show processed frames and poll the keyboard in a background thread,
+        keeping imshow/waitKey off the asyncio loop.
+        
+        The window is created here because HighGUI expects all calls for a
+        window to come from one thread.
+        """
+        self._open_window(window_name)
+        
+        while self.running:
+            try:
+                frame = self._display_q.get(timeout=0.05)
+                cv2.imshow(window_name, frame)
+            except queue.Empty:
+                pass
+            
+            key = cv2.waitKey(10) & 0xFF
+            if key != 0xFF:
+                self._key_q.put(key)
         
-        self.current_throttle = throttle
-        self.current_steering = steering
+        cv2.destroyAllWindows()
     
     def calculate_steering(self, marker_center_x):
         """
@@ -238,29 +502,29 @@ class ArucoNavigationController:
         Returns:
             steering: Steering value from -1.0 (left) to +1.0 (right)
         """
-        if self.frame_width is None:
-            return 0.0
-        
-        frame_center = self.frame_width / 2.0
-        error = marker_center_x - frame_center
+        center = self._frame_center
+        if center is None:
+            if self.frame_width is None:
+                return 0.0
+            center = self._frame_center = self.frame_width * 0.5
         
         # Proportional control
         # Marker on right (error > 0) → Turn right (positive steering)
         # Marker on left (error < 0) → Turn left (negative steering)
-        steering = error * self.steering_kp
+        steering = (marker_center_x - center) * self.steering_kp
         
         # Apply dead zone - no steering if marker is near center
         # This reduces jitter when marker is approximately centered
-        if abs(steering) < self.steering_dead_zone:
-            steering = 0.0
+        if -self.steering_dead_zone < steering < self.steering_dead_zone:
+            return 0.0
         
         # Clamp to max steering
-        steering = max(-self.max_steering, min(self.max_steering, steering))
+        m = self._max_steering
+        steering = m if steering > m else (-m if steering < -m else steering)
         
         # Quantize steering to reduce BLE spam from tiny changes
         # Round to nearest quantization step (e.g., 0.05 intervals)
-        if steering != 0.0:
-            steering = round(steering / self.steering_quantization) * self.steering_quantization
+        steering = round(steering / self.steering_quantization) * self.steering_quantization
         
         return steering
     
@@ -272,7 +536,11 @@ class ArucoNavigationController:
             (throttle, steering, frame_with_overlay)
         """
         # Detect ArUco markers
-        corners, ids, rejected = self.detector.detect(frame)
+        detection = self.detect_markers(frame)
+        if detection is None:
+            # Worker pipeline still filling - hold still for this frame
+            return 0.0, 0.0, frame
+        frame, corners, ids = detection
         
         throttle = 0.0
         steering = 0.0
@@ -311,46 +579,61 @@ class ArucoNavigationController:
                 # Within tolerance, stop
                 throttle = 0.0
             
-            # Add status overlay
-            throttle_byte = to_byte(throttle)
-            steering_byte = to_byte(steering)
-            
-            status_text = [
-                f"ID: {marker_id} | Dist: {distance_cm:.1f}cm",
-                f"Target: {self.target_distance_cm:.1f}cm",
-                f"Error: {distance_cm - self.target_distance_cm:+.1f}cm | Center Err: {center_x - self.frame_width/2:+.0f}px",
-                "",
-                f"COMMANDS TO SEND:",
-                f"Throttle: {throttle:+.2f} (byte: {throttle_byte:3d})",
-                f"Steering: {steering:+.2f} (byte: {steering_byte:3d})"
-            ]
+            # Add status overlay (text + center line re-rendered every few frames)
+            self._overlay_ttl -= 1
+            if self._overlay_ttl <= 0 or self._overlay.shape != frame.shape:
+                throttle_byte, steering_byte = self._pack_cmd(throttle, steering)
+                
+                status_text = [
+                    f"ID: {marker_id} | Dist: {distance_cm:.1f}cm",
+                    self._target_text,
+                    f"Error: {distance_cm - self.target_distance_cm:+.1f}cm | Center Err: {center_x - self._frame_center:+.0f}px",
+                    "",
+                    "COMMANDS TO SEND:",
+                    f"Throttle: {throttle:+.2f} (byte: {throttle_byte:3d})",
+                    f"Steering: {steering:+.2f} (byte: {steering_byte:3d})"
+                ]
+                self._render_overlay(frame.shape, status_text)
+                self._overlay_ttl = self.OVERLAY_REFRESH_FRAMES
             
-            y_offset = 30
-            for i, text in enumerate(status_text):
-                if text == "":
-                    y_offset += 10
-                    continue
-                color = (0, 255, 255) if i >= 4 else (0, 255, 0)  # Yellow for commands
-                cv2.putText(frame, text, (10, y_offset),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-                y_offset += 25
+            cv2.copyTo(self._overlay, self._overlay_mask, frame)
             
-            # Draw center line and marker position
-            cv2.line(frame, (int(self.frame_width/2), 0),
-                    (int(self.frame_width/2), self.frame_height),
-                    (255, 0, 0), 2)
+            # Marker position moves every frame, so it is drawn live
             cv2.circle(frame, (int(center_x), int(center_y)), 5, (0, 255, 255), -1)
             
         else:
             # No marker detected - stop
             throttle = 0.0
             steering = 0.0
+            self._overlay_ttl = 0  # Re-render as soon as the marker is back
             
             cv2.putText(frame, "NO MARKER DETECTED - STOPPED",
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+                       (10, 30), self.OVERLAY_FONT, 1.4, (0, 0, 255), 1)
         
         return throttle, steering, frame
     
+    def _render_overlay(self, shape, status_text):
+        """Rasterize status text and center line onto the persistent overlay layer."""
+        overlay = np.zeros(shape, dtype=np.uint8)
+        
+        y_offset = 30
+        for i, text in enumerate(status_text):
+            if text == "":
+                y_offset += 10
+                continue
+            color = (0, 255, 255) if i >= 4 else (0, 255, 0)  # Yellow for commands
+            cv2.putText(overlay, text, (10, y_offset),
+                       self.OVERLAY_FONT, 1.1, color, 1)
+            y_offset += 25
+        
+        # Center line
+        cv2.line(overlay, self._center_line_p1, self._center_line_p2,
+                (255, 0, 0), 2)
+        
+        self._overlay = overlay
+        # Single-channel copy mask: channel sum saturates, so nonzero = drawn pixel
+        self._overlay_mask = cv2.transform(overlay, _CHANNEL_SUM)
+    
     def process_manual_input(self, key):
         """Process manual control input."""
         # WASD controls
@@ -368,8 +651,12 @@ class ArucoNavigationController:
     
     async def run_async(self):
         """Main control loop (async)."""
+        # Worker processes are started before the capture/BLE threads exist
+        self._start_detection_pool()
+        
         # Initialize camera
         if not self.init_camera():
+            self._stop_detection_pool()
             return
         
         # Connect to BLE
@@ -377,10 +664,7 @@ class ArucoNavigationController:
             print("\nRunning without BLE connection (simulation mode)")
             print("Commands will be calculated but not sent.\n")
         
-        # Window setup
         window_name = "ArUco Navigation - Press 'h' for help"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(window_name, 1280, 720)
         
         print("\n" + "="*60)
         print("ARUCO NAVIGATION CONTROLLER")
@@ -401,13 +685,28 @@ class ArucoNavigationController:
         ble_task = asyncio.create_task(self._ble_sender_task())
         frame_count = 0
         
+        # Start grabber thread
+        loop = asyncio.get_running_loop()
+        self._start_grabber()
+        
+        # Start display thread (creates the window)
+        if self._threaded_display:
+            self._display_thread = threading.Thread(target=self._display_loop,
+                                                    args=(window_name,), daemon=True)
+            self._display_thread.start()
+        else:
+            self._open_window(window_name)
+        
         try:
             while self.running:
-                ret, frame = self.cap.read()
+                frame = await self._next_frame()
                 
-                if not ret or frame is None:
+                if frame is None:
                     print("Failed to read frame")
                     break
+                if self.frame_width is None:
+                    # First read in init_camera failed; take the size from this frame
+                    self._set_frame_geometry(frame)
                 
                 frame_count += 1
                 
@@ -417,52 +716,63 @@ class ArucoNavigationController:
                     steering = self.manual_steering
                     
                     cv2.putText(frame, "MANUAL MODE",
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 165, 255), 3)
+                               (10, 30), self.OVERLAY_FONT, 1.8, (0, 165, 255), 1)
                     cv2.putText(frame, f"Throttle: {throttle:+.2f} | Steering: {steering:+.2f}",
-                               (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+                               (10, 70), self.OVERLAY_FONT, 1.3, (0, 165, 255), 1)
                 
                 elif self.autonomous_mode:
+                    await self._wait_for_detection(loop, frame)
                     throttle, steering, frame = self.process_frame_autonomous(frame)
                     
                     cv2.putText(frame, "AUTONOMOUS MODE",
-                               (10, frame.shape[0] - 20),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                               self._anchor_mode_label,
+                               self.OVERLAY_FONT, 1.3, (0, 255, 0), 1)
                 else:
                     # Paused
                     throttle = 0.0
                     steering = 0.0
                     
                     cv2.putText(frame, "PAUSED",
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
+                               (10, 30), self.OVERLAY_FONT, 1.8, (0, 255, 255), 1)
                 
                 # Update motor command (non-blocking)
                 self.send_motor_command(throttle, steering)
                 
                 # Display frame
-                cv2.imshow(window_name, frame)
+                if self._threaded_display:
+                    # Hand the frame to the display thread, replacing any unshown one
+                    try:
+                        self._display_q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    self._display_q.put_nowait(frame)
+                else:
+                    cv2.imshow(window_name, frame)
+                    key = cv2.waitKey(1) & 0xFF
+                    if key != 0xFF:
+                        self._key_q.put(key)
                 
                 # Handle keyboard input
-                key = cv2.waitKey(1) & 0xFF
-                
-                if key == ord('q'):
-                    print("\nQuitting...")
-                    break
-                elif key == ord('p'):
-                    if not self.manual_mode:
-                        self.autonomous_mode = not self.autonomous_mode
-                        print(f"Autonomous mode: {'ON' if self.autonomous_mode else 'OFF'}")
-                elif key == ord('m'):
-                    self.manual_mode = not self.manual_mode
+                while not self._key_q.empty():
+                    key = self._key_q.get_nowait()
+                    
+                    if key == ord('q'):
+                        print("\nQuitting...")
+                        self.running = False
+                        break
+                    elif key == ord('p'):
+                        if not self.manual_mode:
+                            self.autonomous_mode = not self.autonomous_mode
+                            print(f"Autonomous mode: {'ON' if self.autonomous_mode else 'OFF'}")
+                    elif key == ord('m'):
+                        self.manual_mode = not self.manual_mode
+                        if self.manual_mode:
+                            self.autonomous_mode = False
+                        print(f"Manual mode: {'ON' if self.manual_mode else 'OFF'}")
+                    
+                    # Manual control input
                     if self.manual_mode:
-                        self.autonomous_mode = False
-                    print(f"Manual mode: {'ON' if self.manual_mode else 'OFF'}")
-                
-                # Manual control input
-                if self.manual_mode:
-                    self.process_manual_input(key)
-                
-                # Fast camera loop - minimal delay for responsiveness
-                await asyncio.sleep(0.001)
+                        self.process_manual_input(key)
         
         except KeyboardInterrupt:
             print("\nInterrupted by user")
@@ -475,11 +785,14 @@ class ArucoNavigationController:
             await asyncio.sleep(0.2)  # Give BLE task time to send final command
             ble_task.cancel()
             
-            if self.cap:
-                self.cap.release()
+            if self._display_thread is not None:
+                self._display_thread.join(timeout=1.0)
+            else:
+                cv2.destroyAllWindows()
+            self._stop_detection_pool()
+            self._stop_grabber()
             if self.ble_client and self.ble_client.is_connected:
                 await self.ble_client.disconnect()
-            cv2.destroyAllWindows()
             
             print(f"Total frames processed: {frame_count}")
             print("Goodbye!")
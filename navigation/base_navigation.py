@@ -11,10 +11,19 @@ import cv2
 import sys
 import os
 import yaml
+import select
 import asyncio
+import threading
+import numpy as np
 from abc import ABC, abstractmethod
 from bleak import BleakScanner, BleakClient
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # Add parent directory to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -22,14 +31,204 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 
-def to_byte(val):
-    """Convert value from -1.0 to +1.0 to byte (0-255)."""
-    return int((val + 1) * 127.5)
+# Leave one core for the capture/BLE threads (OMP_NUM_THREADS is set by the
+# entry scripts, before cv2 is first imported)
+_DETECTION_THREADS = max(1, (os.cpu_count() or 2) - 1)
+
+# 1x3 matrix for cv2.transform: sums the B, G and R channels
+_CHANNEL_SUM = np.ones((1, 3), np.float32)
+
+
+def to_byte(val, _int=int):
+    """Convert value from -1.0 to +1.0 to byte (0-255).
+
+    Out-of-range values saturate at 0/255; NaN maps to neutral (127).
+    """
+    # Comparisons instead of max()/min() and int bound as a local: this runs
+    # for every BLE command
+    if val != val:  # NaN
+        return 127
+    val = (val + 1) * 127.5
+    if val <= 0.0:
+        return 0
+    if val >= 255.0:
+        return 255
+    return _int(val)
+
+
+def open_capture(camera_url, hw_acceleration=True):
+    """
+    Open the camera through the FFmpeg backend with hardware decode requested.
+    
+    VIDEO_ACCELERATION_ANY silently falls back to CPU decode where no
+    accelerator is available; if FFmpeg can't open the source at all the
+    default backend is used instead.
+    """
+    params = []
+    if hw_acceleration:
+        params = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+    cap = cv2.VideoCapture(camera_url, cv2.CAP_FFMPEG, params)
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(camera_url)
+    # Cameras that offer MJPG deliver cheap-to-decode JPEG frames (ignored by streams)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    return cap
+
+
+class FrameGrabberMixin:
+    """
+    Capture thread shared by the navigation controllers.
+    
+    cap.grab() runs for every frame so the stream never falls behind, but
+    cap.retrieve() (the JPEG decode) only runs when the control loop has
+    asked for a frame. Expects ``cap`` and ``running`` on the controller.
+    """
+    
+    __slots__ = ()
+    
+    def _init_grabber(self):
+        """Set up the grabber state (call from __init__)."""
+        self._latest_frame = None
+        self._capture_failed = False
+        self._frame_lock = threading.Lock()
+        self._frame_wanted = threading.Event()
+        self._frame_event = None  # asyncio.Event, set from the grabber (see _start_grabber)
+        self._loop = None
+        self._cap_thread = None
+    
+    def _start_grabber(self):
+        """Start the capture thread; must be called from the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._frame_event = asyncio.Event()
+        self._cap_thread = threading.Thread(target=self._grabber, daemon=True)
+        self._cap_thread.start()
+    
+    def _grabber(self):
+        """Keep the capture drained; decode only when _frame_wanted is set."""
+        while self.running:
+            if not self.cap.grab():
+                break
+            if self._frame_wanted.is_set():
+                self._frame_wanted.clear()
+                ret, frame = self.cap.retrieve()
+                if not ret:
+                    break
+                with self._frame_lock:
+                    self._latest_frame = frame
+                self._notify_frame()
+        
+        self._capture_failed = True
+        self._notify_frame()
+    
+    def _notify_frame(self):
+        """Wake the control loop from the grabber thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._frame_event.set)
+        except RuntimeError:
+            pass  # Event loop already closed during shutdown
+    
+    def _take_frame(self):
+        """Return the newest decoded frame (or None) and request the next one."""
+        with self._frame_lock:
+            frame, self._latest_frame = self._latest_frame, None
+        if frame is not None or not self._frame_wanted.is_set():
+            self._frame_wanted.set()
+        return frame
+    
+    async def _next_frame(self):
+        """Wait for the newest decoded frame; None once the capture has failed."""
+        while True:
+            frame = self._take_frame()
+            if frame is not None:
+                return frame
+            if self._capture_failed:
+                return None
+            # Sleep until the grabber has decoded the requested frame
+            await self._frame_event.wait()
+            self._frame_event.clear()
+    
+    def _stop_grabber(self):
+        """Join the grabber thread and release the capture."""
+        if self._cap_thread is not None:
+            self._cap_thread.join(timeout=1.0)
+        # Only release once the grabber has exited: it may still be inside
+        # cap.grab() after the join timeout (the daemon thread ends with the process)
+        if self.cap and (self._cap_thread is None or not self._cap_thread.is_alive()):
+            self.cap.release()
+
+
+class BleCommandMixin:
+    """
+    Motor command state and the BLE sender task shared by the navigation controllers.
+    
+    Expects ``ble_client``, ``ble_command_char``, ``ble_throttle_char``,
+    ``ble_steering_char`` and ``running`` on the controller.
+    """
+    
+    __slots__ = ()
+    
+    def _init_commands(self):
+        """Set up the command state (call from __init__)."""
+        self.current_throttle = 0.0
+        self.current_steering = 0.0
+        self._latest_cmd = self._pack_cmd(0.0, 0.0)  # BLE payload for the values above
+    
+    async def _ble_sender_task(self):
+        """Dedicated background task for sending BLE commands at 4Hz (250ms)."""
+        last_cmd = None
+        
+        while self.running:
+            try:
+                if self.ble_client and self.ble_client.is_connected:
+                    cmd = self._latest_cmd
+                    
+                    # Only send if values changed to avoid spamming ESP32
+                    # Write-without-response: the 2-byte _pack_cmd payload (or its
+                    # two 1-byte halves) needs no ACK round-trip
+                    if cmd != last_cmd:
+                        if self.ble_command_char is not None:
+                            # One GATT write carries both commands: [throttle, steering]
+                            await self.ble_client.write_gatt_char(self.ble_command_char, cmd, response=False)
+                        else:
+                            await self.ble_client.write_gatt_char(self.ble_throttle_char, cmd[0:1], response=False)
+                            await self.ble_client.write_gatt_char(self.ble_steering_char, cmd[1:2], response=False)
+                        print(f"[BLE TX] Throttle: {self.current_throttle:+.2f} ({cmd[0]:3d}) | Steering: {self.current_steering:+.2f} ({cmd[1]:3d})")
+                        last_cmd = cmd
+                
+                # Send at 4Hz (250ms interval) - gentler on ESP32
+                await asyncio.sleep(0.25)
+            except Exception as e:
+                print(f"[BLE sender error: {e}]")
+                await asyncio.sleep(0.5)
+    
+    @staticmethod
+    def _pack_cmd(throttle, steering):
+        """Encode throttle and steering as the 2-byte BLE payload [throttle, steering]."""
+        return bytes((to_byte(throttle), to_byte(steering)))
+    
+    def send_motor_command(self, throttle, steering):
+        """
+        Update motor command values (non-blocking).
+        Background task handles actual BLE transmission.
+        
+        Args:
+            throttle: -1.0 to +1.0
+            steering: -1.0 to +1.0
+        """
+        # Clamp and store values - background task will send them
+        self.current_throttle = max(-1.0, min(1.0, throttle))
+        self.current_steering = max(-1.0, min(1.0, steering))
+        
+        # Publish the encoded payload as one immutable object
+        self._latest_cmd = self._pack_cmd(self.current_throttle, self.current_steering)
 
 
-class BaseNavigationController(ABC):
+class BaseNavigationController(FrameGrabberMixin, BleCommandMixin, ABC):
     """Base class for navigation controllers with different vision targets."""
     
+    # Rendered banners kept by _draw_banner (manual mode text changes with the commands)
+    BANNER_CACHE_SIZE = 64
+    
     def __init__(self, config_path=None):
         """Initialize the base navigation controller."""
         if config_path is None:
@@ -42,6 +241,9 @@ class BaseNavigationController(ABC):
         camera_cfg = self.config['camera']
         nav_cfg = self.config.get('navigation', {})
         
+        # OpenCV's default thread count depends on the environment (1 in some containers)
+        cv2.setNumThreads(_DETECTION_THREADS)
+        
         # Camera setup
         self.camera_url = camera_cfg['url']
         self.cap = None
@@ -50,6 +252,7 @@ class BaseNavigationController(ABC):
         
         # Navigation parameters
         self.max_steering = nav_cfg.get('max_steering', 0.6)
+        self._max_steering = float(self.max_steering)
         self.steering_kp = nav_cfg.get('steering_kp', 0.003)
         self.base_throttle = nav_cfg.get('base_throttle', 0.3)
         self.backward_throttle_multiplier = nav_cfg.get('backward_throttle_multiplier', 0.5)
@@ -57,6 +260,7 @@ class BaseNavigationController(ABC):
         # Steering quantization and dead zone
         self.steering_dead_zone = nav_cfg.get('steering_dead_zone', 0.1)
         self.steering_quantization = nav_cfg.get('steering_quantization', 0.05)
+        self._frame_center = None  # Cached frame_width / 2, set in init_camera
         
         # BLE setup
         ble_cfg = nav_cfg.get('ble', {})
@@ -64,22 +268,33 @@ class BaseNavigationController(ABC):
         self.ble_service_uuid = ble_cfg.get('service_uuid', '12345678-1234-5678-1234-56789abcdef0')
         self.ble_throttle_uuid = ble_cfg.get('char_throttle_uuid', '12345678-1234-5678-1234-56789abcdef2')
         self.ble_steering_uuid = ble_cfg.get('char_steering_uuid', '12345678-1234-5678-1234-56789abcdef3')
+        self.ble_command_uuid = ble_cfg.get('char_command_uuid', '12345678-1234-5678-1234-56789abcdef4')
+        
+        # No window or overlays; keys are read from stdin instead
+        self.headless = nav_cfg.get('headless', False)
         
         # State
         self.autonomous_mode = True
         self.manual_mode = False
         self.running = True
         
-        # BLE client
+        # BLE client and characteristics (resolved once after connecting)
         self.ble_client = None
+        self.ble_command_char = None  # Combined throttle+steering characteristic, if supported
+        self.ble_throttle_char = None
+        self.ble_steering_char = None
         
         # Manual control state
         self.manual_throttle = 0.0
         self.manual_steering = 0.0
         
         # Current commands
-        self.current_throttle = 0.0
-        self.current_steering = 0.0
+        self._init_commands()
+        
+        # Mode banners rasterized once: (text, scale, color, thickness) -> (strip, mask, pad, ascent)
+        self._banners = {}
+        
+        self._init_grabber()
     
     def load_config(self, config_path):
         """Load configuration from YAML file."""
@@ -89,7 +304,7 @@ class BaseNavigationController(ABC):
         
         try:
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
             print(f"Loaded configuration from: {config_path}")
             return config
         except Exception as e:
@@ -111,7 +326,8 @@ class BaseNavigationController(ABC):
                     'device_name': 'BLE_Sensor_Hub',
                     'service_uuid': '12345678-1234-5678-1234-56789abcdef0',
                     'char_throttle_uuid': '12345678-1234-5678-1234-56789abcdef2',
-                    'char_steering_uuid': '12345678-1234-5678-1234-56789abcdef3'
+                    'char_steering_uuid': '12345678-1234-5678-1234-56789abcdef3',
+                    'char_command_uuid': '12345678-1234-5678-1234-56789abcdef4'
                 }
             }
         }
@@ -119,8 +335,8 @@ class BaseNavigationController(ABC):
     async def connect_ble(self):
         """Connect to BLE sensor hub."""
         print(f"\nScanning for BLE device '{self.ble_device_name}'...")
-        devices = await BleakScanner.discover(timeout=10.0) 
-        target_device = next((d for d in devices if d.name == self.ble_device_name), None)
+        # Returns as soon as the device advertises instead of always scanning 10 s
+        target_device = await BleakScanner.find_device_by_name(self.ble_device_name, timeout=10.0)
         
         if not target_device:
             print(f"WARNING: BLE device '{self.ble_device_name}' not found!")
@@ -137,13 +353,24 @@ class BaseNavigationController(ABC):
             print("ERROR: Failed to connect to BLE device")
             return False
         
+        # Look the characteristics up once instead of by UUID on every write.
+        # The combined 2-byte command characteristic is only on newer firmware.
+        services = self.ble_client.services
+        self.ble_command_char = services.get_characteristic(self.ble_command_uuid)
+        self.ble_throttle_char = services.get_characteristic(self.ble_throttle_uuid) or self.ble_throttle_uuid
+        self.ble_steering_char = services.get_characteristic(self.ble_steering_uuid) or self.ble_steering_uuid
+        if self.ble_command_char is not None:
+            print("Using combined throttle+steering characteristic")
+        else:
+            print("Combined characteristic not found, using separate throttle/steering writes")
+        
         print("Connected successfully!\n")
         return True
     
     def init_camera(self):
         """Initialize camera connection."""
         print(f"Connecting to camera at {self.camera_url}...")
-        self.cap = cv2.VideoCapture(self.camera_url)
+        self.cap = open_capture(self.camera_url, self.config['camera'].get('hw_acceleration', True))
         
         if not self.cap.isOpened():
             print(f"ERROR: Failed to connect to camera")
@@ -154,58 +381,29 @@ class BaseNavigationController(ABC):
         ret, frame = self.cap.read()
         if ret:
             self.frame_height, self.frame_width = frame.shape[:2]
+            self._frame_center = self.frame_width * 0.5
             print(f"Camera connected: {self.frame_width}x{self.frame_height}")
         
         print("Camera connected successfully")
         return True
     
-    async def _ble_sender_task(self):
-        """Dedicated background task for sending BLE commands at 4Hz (250ms)."""
-        last_throttle_byte = None
-        last_steering_byte = None
-        
-        while self.running:
-            try:
-                if self.ble_client and self.ble_client.is_connected:
-                    throttle_byte = to_byte(self.current_throttle)
-                    steering_byte = to_byte(self.current_steering)
-                    
-                    if throttle_byte != last_throttle_byte or steering_byte != last_steering_byte:
-                        await self.ble_client.write_gatt_char(self.ble_throttle_uuid, bytearray([throttle_byte]))
-                        await self.ble_client.write_gatt_char(self.ble_steering_uuid, bytearray([steering_byte]))
-                        print(f"[BLE TX] Throttle: {self.current_throttle:+.2f} ({throttle_byte:3d}) | Steering: {self.current_steering:+.2f} ({steering_byte:3d})")
-                        last_throttle_byte = throttle_byte
-                        last_steering_byte = steering_byte
-                
-                await asyncio.sleep(0.25)
-            except Exception as e:
-                print(f"[BLE sender error: {e}]")
-                await asyncio.sleep(0.5)
-    
-    def send_motor_command(self, throttle, steering):
-        """Update motor command values (non-blocking)."""
-        self.current_throttle = max(-1.0, min(1.0, throttle))
-        self.current_steering = max(-1.0, min(1.0, steering))
-    
     def calculate_steering(self, target_center_x):
         """Calculate steering based on target position with dead zone and quantization."""
-        if self.frame_width is None:
-            return 0.0
-        
-        frame_center = self.frame_width / 2.0
-        error = target_center_x - frame_center
+        center = self._frame_center
+        if center is None:
+            if self.frame_width is None:
+                return 0.0
+            center = self._frame_center = self.frame_width * 0.5
         
-        steering = error * self.steering_kp
+        steering = (target_center_x - center) * self.steering_kp
         
-        if abs(steering) < self.steering_dead_zone:
-            steering = 0.0
-        
-        steering = max(-self.max_steering, min(self.max_steering, steering))
+        if -self.steering_dead_zone < steering < self.steering_dead_zone:
+            return 0.0
         
-        if steering != 0.0:
-            steering = round(steering / self.steering_quantization) * self.steering_quantization
+        m = self._max_steering
+        steering = m if steering > m else (-m if steering < -m else steering)
         
-        return steering
+        return round(steering / self.steering_quantization) * self.steering_quantization
     
     def process_manual_input(self, key):
         """Process manual control input."""
@@ -221,6 +419,74 @@ class BaseNavigationController(ABC):
             self.manual_throttle = 0.0
             self.manual_steering = 0.0
     
+    def _draw_banner(self, frame, text, org, font_scale, color, thickness):
+        """
+        Draw text like cv2.putText (FONT_HERSHEY_SIMPLEX), from a cached strip.
+        
+        Each distinct banner is rasterized once; later frames only copy its
+        drawn pixels into the frame.
+        
+        Returns:
+            x where text following the banner on the same line starts
+        """
+        if self.headless:
+            return org[0]
+        
+        key = (text, font_scale, color, thickness)
+        banner = self._banners.get(key)
+        if banner is None:
+            if len(self._banners) >= self.BANNER_CACHE_SIZE:
+                self._banners.clear()
+            (width, ascent), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+            pad = thickness
+            strip = np.zeros((ascent + baseline + 2 * pad, width + 2 * pad, 3), np.uint8)
+            cv2.putText(strip, text, (pad, ascent + pad), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
+            # Single-channel copy mask: channel sum saturates, so nonzero = drawn pixel
+            # getTextSize's width includes the thickness on top of the glyph advances
+            banner = self._banners[key] = (strip, cv2.transform(strip, _CHANNEL_SUM), pad, ascent,
+                                           width - thickness)
+        
+        strip, mask, pad, ascent, advance = banner
+        x0, y0 = org[0] - pad, org[1] - ascent - pad
+        # Clip the strip to the frame
+        sx0, sy0 = max(0, -x0), max(0, -y0)
+        sx1 = min(strip.shape[1], frame.shape[1] - x0)
+        sy1 = min(strip.shape[0], frame.shape[0] - y0)
+        if sx1 > sx0 and sy1 > sy0:
+            cv2.copyTo(strip[sy0:sy1, sx0:sx1], mask[sy0:sy1, sx0:sx1],
+                       frame[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1])
+        return org[0] + advance
+    
+    def _open_window(self, window_name):
+        """Create the display window (nothing to do when headless)."""
+        if self.headless:
+            print("Headless: type a control key and press Enter")
+            return
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, 1280, 720)
+    
+    def _show_frame(self, window_name, frame):
+        """
+        Display the frame and return the key pressed (0xFF if none).
+        
+        Headless, nothing is displayed and a key is the first character of a
+        line typed on stdin (not available on Windows; use Ctrl+C to stop).
+        """
+        if not self.headless:
+            cv2.imshow(window_name, frame)
+            return cv2.waitKey(1) & 0xFF
+        
+        if sys.platform != 'win32' and select.select([sys.stdin], [], [], 0)[0]:
+            line = sys.stdin.readline().strip()
+            if line:
+                return ord(line[0])
+        return 0xFF
+    
+    def _close_window(self):
+        """Destroy the display window, if one was opened."""
+        if not self.headless:
+            cv2.destroyAllWindows()
+    
     @abstractmethod
     def get_detector_name(self):
         """Return the name of this detector (e.g., 'ArUco', 'Color')."""
@@ -244,8 +510,7 @@ class BaseNavigationController(ABC):
         await self.connect_ble()
         
         window_name = f"{self.get_detector_name()} Navigation"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(window_name, 1280, 720)
+        self._open_window(window_name)
         
         print("\n" + "="*60)
         print(f"{self.get_detector_name().upper()} NAVIGATION CONTROLLER")
@@ -263,11 +528,14 @@ class BaseNavigationController(ABC):
         ble_task = asyncio.create_task(self._ble_sender_task())
         frame_count = 0
         
+        # Capture runs in its own thread so network reads never block the loop
+        self._start_grabber()
+        
         try:
             while self.running:
-                ret, frame = self.cap.read()
+                frame = await self._next_frame()
                 
-                if not ret or frame is None:
+                if frame is None:
                     print("Failed to read frame")
                     break
                 
@@ -277,29 +545,26 @@ class BaseNavigationController(ABC):
                     throttle = self.manual_throttle
                     steering = self.manual_steering
                     
-                    cv2.putText(frame, "MANUAL MODE",
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 165, 255), 3)
-                    cv2.putText(frame, f"Throttle: {throttle:+.2f} | Steering: {steering:+.2f}",
-                               (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+                    self._draw_banner(frame, "MANUAL MODE",
+                                     (10, 30), 1.0, (0, 165, 255), 3)
+                    self._draw_banner(frame, f"Throttle: {throttle:+.2f} | Steering: {steering:+.2f}",
+                                     (10, 70), 0.7, (0, 165, 255), 2)
                 
                 elif self.autonomous_mode:
                     throttle, steering, frame = self.process_frame_autonomous(frame)
                     
-                    cv2.putText(frame, "AUTONOMOUS MODE",
-                               (10, frame.shape[0] - 20),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                    self._draw_banner(frame, "AUTONOMOUS MODE",
+                                     (10, frame.shape[0] - 20), 0.7, (0, 255, 0), 2)
                 else:
                     throttle = 0.0
                     steering = 0.0
                     
-                    cv2.putText(frame, "PAUSED",
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
+                    self._draw_banner(frame, "PAUSED",
+                                     (10, 30), 1.0, (0, 255, 255), 3)
                 
                 self.send_motor_command(throttle, steering)
                 
-                cv2.imshow(window_name, frame)
-                
-                key = cv2.waitKey(1) & 0xFF
+                key = self._show_frame(window_name, frame)
                 
                 if key == ord('q'):
                     print("\nQuitting...")
@@ -317,7 +582,9 @@ class BaseNavigationController(ABC):
                 if self.manual_mode:
                     self.process_manual_input(key)
                 
-                await asyncio.sleep(0.001)
+                # Frames pace the loop (_next_frame waits for the grabber);
+                # just let the BLE sender run if the next one is already waiting
+                await asyncio.sleep(0)
         
         except KeyboardInterrupt:
             print("\nInterrupted by user")
@@ -329,11 +596,10 @@ class BaseNavigationController(ABC):
             await asyncio.sleep(0.2)
             ble_task.cancel()
             
-            if self.cap:
-                self.cap.release()
+            self._stop_grabber()
             if self.ble_client and self.ble_client.is_connected:
                 await self.ble_client.disconnect()
-            cv2.destroyAllWindows()
+            self._close_window()
             
             print(f"Total frames processed: {frame_count}")
             print("Goodbye!")
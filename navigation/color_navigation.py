@@ -25,25 +25,72 @@ import sys
 import os
 import yaml
 import time
+import queue
 import asyncio
+import threading
 import numpy as np
 from bleak import BleakScanner, BleakClient
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # Add parent directory to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+from navigation.base_navigation import (
+    _CHANNEL_SUM, BleCommandMixin, FrameGrabberMixin, open_capture
+)
+
+
+def set_bluez_conn_interval(min_interval, max_interval, adapter='hci0'):
+    """Set BlueZ's preferred LE connection interval for new connections.
+
+    Values are in 1.25 ms units (6 = 7.5 ms). This is an adapter-wide kernel
+    setting (debugfs) that affects every BLE connection on the host, so the
+    caller should restore the returned previous values when done. Needs
+    Linux, a mounted debugfs and root.
 
-def to_byte(val):
-    """Convert value from -1.0 to +1.0 to byte (0-255)."""
-    return int((val + 1) * 127.5)
+    Returns:
+        The previous (min, max) interval, or None if nothing was changed
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    base = f'/sys/kernel/debug/bluetooth/{adapter}'
+    try:
+        previous = []
+        for name in ('conn_min_interval', 'conn_max_interval'):
+            with open(os.path.join(base, name)) as f:
+                previous.append(int(f.read()))
+    except (OSError, ValueError) as e:
+        print(f"Could not read BLE connection interval: {e}")
+        return None
+    
+    writes = [('conn_min_interval', min_interval), ('conn_max_interval', max_interval)]
+    # The kernel rejects min > max after each write, so try both orders
+    for order in (writes, writes[::-1]):
+        try:
+            for name, value in order:
+                with open(os.path.join(base, name), 'w') as f:
+                    f.write(str(int(value)))
+            return tuple(previous)
+        except OSError as e:
+            error = e
+    print(f"Could not set BLE connection interval: {error}")
+    return None
 
 
-class ColorNavigationController:
+class ColorNavigationController(FrameGrabberMixin, BleCommandMixin):
     """Controller for color-based autonomous navigation via BLE."""
     
+    # Status text is rasterized once per this many frames and blitted in between
+    OVERLAY_REFRESH_FRAMES = 5
+    
     def __init__(self, config_path=None):
         """Initialize the navigation controller."""
         if config_path is None:
@@ -62,13 +109,21 @@ class ColorNavigationController:
         self.cap = None
         
         # Color tracking parameters
-        self.hsv_lower = np.array(color_cfg.get('hsv_lower', [0, 100, 100]))
-        self.hsv_upper = np.array(color_cfg.get('hsv_upper', [10, 255, 255]))
+        self.set_hsv_range(color_cfg.get('hsv_lower', [0, 100, 100]),
+                           color_cfg.get('hsv_upper', [10, 255, 255]))
         self.min_contour_area = color_cfg.get('min_contour_area', 500)
         self.target_area_ratio = color_cfg.get('target_area_ratio', 0.05)  # Target object size as ratio of frame
+        self.detection_width = color_cfg.get('detection_width', 320)  # 0 = detect at full resolution
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        
+        # Detection and overlay buffers, reused every frame (see _alloc_buffers)
+        self._hsv = None
+        self._mask = None
+        self._mask_small = np.empty((240, 320), np.uint8)
         
         # Navigation parameters
         self.max_steering = nav_cfg.get('max_steering', 0.6)
+        self._max_steering = float(self.max_steering)
         self.steering_kp = nav_cfg.get('steering_kp', 0.003)
         self.base_throttle = nav_cfg.get('base_throttle', 0.3)
         
@@ -82,6 +137,9 @@ class ColorNavigationController:
         self.ble_service_uuid = ble_cfg.get('service_uuid', '12345678-1234-5678-1234-56789abcdef0')
         self.ble_throttle_uuid = ble_cfg.get('char_throttle_uuid', '12345678-1234-5678-1234-56789abcdef2')
         self.ble_steering_uuid = ble_cfg.get('char_steering_uuid', '12345678-1234-5678-1234-56789abcdef3')
+        self.ble_command_uuid = ble_cfg.get('char_command_uuid', '12345678-1234-5678-1234-56789abcdef4')
+        self.ble_conn_min_interval = ble_cfg.get('conn_min_interval')  # None = BlueZ default
+        self.ble_conn_max_interval = ble_cfg.get('conn_max_interval')
         
         # State
         self.autonomous_mode = True
@@ -89,17 +147,35 @@ class ColorNavigationController:
         self.running = True
         self.frame_width = None
         self.frame_height = None
+        self._frame_center = None  # Cached frame_width / 2, set in init_camera
         
-        # BLE client
+        # BLE client and characteristics (resolved once after connecting)
         self.ble_client = None
+        self.ble_command_char = None  # Combined throttle+steering characteristic, if supported
+        self.ble_throttle_char = None
+        self.ble_steering_char = None
         
         # Manual control state
         self.manual_throttle = 0.0
         self.manual_steering = 0.0
         
         # Current commands
-        self.current_throttle = 0.0
-        self.current_steering = 0.0
+        self._init_commands()
+        
+        # Status overlay layer, re-rendered every OVERLAY_REFRESH_FRAMES frames
+        self._overlay = None
+        self._overlay_mask = None
+        self._overlay_ttl = 0
+        
+        # Grabber thread: grabs continuously, decodes only when a frame is wanted
+        self._init_grabber()
+        
+        # Display thread owns the HighGUI window; keypresses come back via _key_q.
+        # Cocoa only allows GUI calls on the main thread, so macOS displays inline.
+        self._threaded_display = sys.platform != 'darwin'
+        self._display_q = queue.Queue(maxsize=1)
+        self._key_q = queue.Queue()
+        self._display_thread = None
         
     def load_config(self, config_path):
         """Load configuration from YAML file."""
@@ -109,7 +185,7 @@ class ColorNavigationController:
         
         try:
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
             print(f"Loaded configuration from: {config_path}")
             return config
         except Exception as e:
@@ -124,7 +200,8 @@ class ColorNavigationController:
                 'hsv_lower': [0, 100, 100],
                 'hsv_upper': [10, 255, 255],
                 'min_contour_area': 500,
-                'target_area_ratio': 0.05
+                'target_area_ratio': 0.05,
+                'detection_width': 320
             },
             'navigation': {
                 'max_steering': 0.6,
@@ -136,7 +213,8 @@ class ColorNavigationController:
                     'device_name': 'BLE_Sensor_Hub',
                     'service_uuid': '12345678-1234-5678-1234-56789abcdef0',
                     'char_throttle_uuid': '12345678-1234-5678-1234-56789abcdef2',
-                    'char_steering_uuid': '12345678-1234-5678-1234-56789abcdef3'
+                    'char_steering_uuid': '12345678-1234-5678-1234-56789abcdef3',
+                    'char_command_uuid': '12345678-1234-5678-1234-56789abcdef4'
                 }
             }
         }
@@ -144,8 +222,8 @@ class ColorNavigationController:
     async def connect_ble(self):
         """Connect to BLE sensor hub."""
         print(f"\nScanning for BLE device '{self.ble_device_name}'...")
-        devices = await BleakScanner.discover(timeout=10.0) 
-        target_device = next((d for d in devices if d.name == self.ble_device_name), None)
+        # Returns as soon as the device advertises instead of always scanning 10 s
+        target_device = await BleakScanner.find_device_by_name(self.ble_device_name, timeout=10.0)
         
         if not target_device:
             print(f"ERROR: BLE device '{self.ble_device_name}' not found!")
@@ -153,22 +231,49 @@ class ColorNavigationController:
             return False
         
         print(f"Found device at {target_device.address}")
+        
+        # Applies to the connection made below, so it must be set first
+        saved_interval = None
+        if self.ble_conn_min_interval and self.ble_conn_max_interval:
+            saved_interval = set_bluez_conn_interval(
+                self.ble_conn_min_interval, self.ble_conn_max_interval)
+            if saved_interval:
+                print(f"BLE connection interval: {self.ble_conn_min_interval * 1.25:.2f}-"
+                      f"{self.ble_conn_max_interval * 1.25:.2f} ms")
+        
         print("Connecting...")
         
         self.ble_client = BleakClient(target_device.address)
-        await self.ble_client.connect()
+        try:
+            await self.ble_client.connect()
+        finally:
+            # The interval is fixed when the connection is created; restore the
+            # host-wide setting right away so other BLE connections keep theirs
+            if saved_interval:
+                set_bluez_conn_interval(*saved_interval)
         
         if not self.ble_client.is_connected:
             print("ERROR: Failed to connect to BLE device")
             return False
         
+        # Look the characteristics up once instead of by UUID on every write.
+        # The combined 2-byte command characteristic is only on newer firmware.
+        services = self.ble_client.services
+        self.ble_command_char = services.get_characteristic(self.ble_command_uuid)
+        self.ble_throttle_char = services.get_characteristic(self.ble_throttle_uuid) or self.ble_throttle_uuid
+        self.ble_steering_char = services.get_characteristic(self.ble_steering_uuid) or self.ble_steering_uuid
+        if self.ble_command_char is not None:
+            print("Using combined throttle+steering characteristic")
+        else:
+            print("Combined characteristic not found, using separate throttle/steering writes")
+        
         print("Connected successfully!\n")
         return True
     
     def init_camera(self):
         """Initialize camera connection."""
         print(f"Connecting to camera at {self.camera_url}...")
-        self.cap = cv2.VideoCapture(self.camera_url)
+        self.cap = open_capture(self.camera_url, self.config['camera'].get('hw_acceleration', True))
         
         if not self.cap.isOpened():
             print(f"ERROR: Failed to connect to camera")
@@ -181,89 +286,117 @@ class ColorNavigationController:
         ret, frame = self.cap.read()
         if ret:
             self.frame_height, self.frame_width = frame.shape[:2]
+            self._frame_center = self.frame_width * 0.5
             print(f"Camera connected: {self.frame_width}x{self.frame_height}")
         
         print("Camera connected successfully")
         return True
     
-    async def _ble_sender_task(self):
-        """Dedicated background task for sending BLE commands at 4Hz (250ms)."""
-        last_throttle_byte = None
-        last_steering_byte = None
+    def _open_window(self, window_name):
+        """Create the display window (from the thread that will draw into it)."""
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, 1280, 720)
+    
+    def _display_loop(self, window_name):
+        """
+        Show processed frames and poll the keyboard in a background thread,
+        keeping imshow/waitKey off the asyncio loop.
+        
+        The window is created here because HighGUI expects all calls for a
+        window to come from one thread.
+        """
+        self._open_window(window_name)
         
         while self.running:
             try:
-                if self.ble_client and self.ble_client.is_connected:
-                    throttle_byte = to_byte(self.current_throttle)
-                    steering_byte = to_byte(self.current_steering)
-                    
-                    # Only send if values changed to avoid spamming ESP32
-                    if throttle_byte != last_throttle_byte or steering_byte != last_steering_byte:
-                        await self.ble_client.write_gatt_char(self.ble_throttle_uuid, bytearray([throttle_byte]))
-                        await self.ble_client.write_gatt_char(self.ble_steering_uuid, bytearray([steering_byte]))
-                        print(f"[BLE TX] Throttle: {self.current_throttle:+.2f} ({throttle_byte:3d}) | Steering: {self.current_steering:+.2f} ({steering_byte:3d})")
-                        last_throttle_byte = throttle_byte
-                        last_steering_byte = steering_byte
-                
-                # Send at 4Hz (250ms interval) - gentler on ESP32
-                await asyncio.sleep(0.25)
-            except Exception as e:
-                print(f"[BLE sender error: {e}]")
-                await asyncio.sleep(0.5)
+                frame = self._display_q.get(timeout=0.05)
+                cv2.imshow(window_name, frame)
+            except queue.Empty:
+                pass
+            
+            key = cv2.waitKey(10) & 0xFF
+            if key != 0xFF:
+                self._key_q.put(key)
+        
+        cv2.destroyAllWindows()
     
-    def send_motor_command(self, throttle, steering):
-        """
-        Update motor command values (non-blocking).
-        Background task handles actual BLE transmission.
-        """
-        self.current_throttle = max(-1.0, min(1.0, throttle))
-        self.current_steering = max(-1.0, min(1.0, steering))
+    def set_hsv_range(self, hsv_lower, hsv_upper):
+        """Set the tracked HSV range and pick the mask path specialized for it."""
+        self.hsv_lower = np.array(hsv_lower)
+        self.hsv_upper = np.array(hsv_upper)
+        # When S and V accept every value only the hue plane needs comparing,
+        # which is about twice as fast as the 3-channel inRange
+        self._hue_only = (self.hsv_lower[1] <= 0 and self.hsv_lower[2] <= 0 and
+                          self.hsv_upper[1] >= 255 and self.hsv_upper[2] >= 255)
+    
+    def _alloc_buffers(self, height, width):
+        """(Re)allocate the detection-resolution HSV image and mask."""
+        self._hsv = np.empty((height, width, 3), np.uint8)
+        self._mask = np.empty((height, width), np.uint8)
     
     def calculate_steering(self, target_center_x):
         """
         Calculate steering based on target position with dead zone and quantization.
         """
-        if self.frame_width is None:
-            return 0.0
-        
-        frame_center = self.frame_width / 2.0
-        error = target_center_x - frame_center
+        center = self._frame_center
+        if center is None:
+            if self.frame_width is None:
+                return 0.0
+            center = self._frame_center = self.frame_width * 0.5
         
         # Proportional control
-        steering = error * self.steering_kp
+        steering = (target_center_x - center) * self.steering_kp
         
         # Apply dead zone
-        if abs(steering) < self.steering_dead_zone:
-            steering = 0.0
+        if -self.steering_dead_zone < steering < self.steering_dead_zone:
+            return 0.0
         
         # Clamp to max steering
-        steering = max(-self.max_steering, min(self.max_steering, steering))
+        m = self._max_steering
+        steering = m if steering > m else (-m if steering < -m else steering)
         
         # Quantize steering
-        if steering != 0.0:
-            steering = round(steering / self.steering_quantization) * self.steering_quantization
-        
-        return steering
+        return round(steering / self.steering_quantization) * self.steering_quantization
     
     def detect_color_target(self, frame):
         """
         Detect colored object in frame using HSV color space.
         
+        Detection runs on a copy downscaled to detection_width; the center and
+        area are scaled back to full-frame coordinates.
+        
         Returns:
-            (center_x, center_y, area, mask) or (None, None, 0, mask)
+            (center_x, center_y, area, mask) or (None, None, 0, mask),
+            with the mask at detection resolution
         """
-        # Convert to HSV
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        height, width = frame.shape[:2]
+        scale = 1.0
+        if self.detection_width and width > self.detection_width:
+            scale = width / self.detection_width
+            height, width = round(height / scale), self.detection_width
+        if self._hsv is None or self._hsv.shape[:2] != (height, width):
+            self._alloc_buffers(height, width)
+        
+        # Convert to HSV (downscaling first), in place in the HSV buffer
+        hsv = self._hsv
+        if scale != 1.0:
+            cv2.resize(frame, (width, height), dst=hsv, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(hsv, cv2.COLOR_BGR2HSV, dst=hsv)
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv)
         
         # Create mask
-        mask = cv2.inRange(hsv, self.hsv_lower, self.hsv_upper)
+        if self._hue_only:
+            hue = cv2.extractChannel(hsv, 0, dst=self._mask)
+            mask = cv2.inRange(hue, int(self.hsv_lower[0]), int(self.hsv_upper[0]), dst=self._mask)
+        else:
+            mask = cv2.inRange(hsv, self.hsv_lower, self.hsv_upper, dst=self._mask)
         
-        # Morphological operations to reduce noise
-        kernel = np.ones((5, 5), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+        # Morphological operations to reduce noise (in place on the mask)
+        cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._morph_kernel, dst=mask)
+        cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._morph_kernel, dst=mask)
         
-        # Find contours
+        # Find contours (cheaper than labelling every pixel: only blob borders are walked)
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
         if not contours:
@@ -271,18 +404,16 @@ class ColorNavigationController:
         
         # Find largest contour
         largest_contour = max(contours, key=cv2.contourArea)
-        area = cv2.contourArea(largest_contour)
+        area = cv2.contourArea(largest_contour) * scale * scale
         
         if area < self.min_contour_area:
             return None, None, 0, mask
         
-        # Get center
-        M = cv2.moments(largest_contour)
-        if M["m00"] == 0:
-            return None, None, 0, mask
-        
-        center_x = int(M["m10"] / M["m00"])
-        center_y = int(M["m01"] / M["m00"])
+        # Get center (of the bounding box: 4 min/max instead of full moments).
+        # Same computation as ColorTargetDetector.detect
+        x, y, w, h = cv2.boundingRect(largest_contour)
+        center_x = int((x + w * 0.5) * scale)
+        center_y = int((y + h * 0.5) * scale)
         
         return center_x, center_y, area, mask
     
@@ -323,49 +454,62 @@ class ColorNavigationController:
             else:  # Just right
                 throttle = 0.0
             
-            # Add status overlay
-            throttle_byte = to_byte(throttle)
-            steering_byte = to_byte(steering)
-            
-            status_text = [
-                f"Target detected at ({center_x}, {center_y})",
-                f"Area: {area:.0f}px | Ratio: {area_ratio:.3f} (Target: {self.target_area_ratio:.3f})",
-                f"Size Error: {size_error:+.3f}",
-                "",
-                f"COMMANDS:",
-                f"Throttle: {throttle:+.2f} (byte: {throttle_byte:3d})",
-                f"Steering: {steering:+.2f} (byte: {steering_byte:3d})"
-            ]
-            
-            y_offset = 30
-            for i, text in enumerate(status_text):
-                if text == "":
-                    y_offset += 10
-                    continue
-                color = (0, 255, 255) if i >= 4 else (0, 255, 0)
-                cv2.putText(frame, text, (10, y_offset),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-                y_offset += 25
+            # Add status overlay (text + center line re-rendered every few frames)
+            self._overlay_ttl -= 1
+            if self._overlay_ttl <= 0 or self._overlay.shape != frame.shape:
+                throttle_byte, steering_byte = self._pack_cmd(throttle, steering)
+                
+                status_text = [
+                    f"Target detected at ({center_x}, {center_y})",
+                    f"Area: {area:.0f}px | Ratio: {area_ratio:.3f} (Target: {self.target_area_ratio:.3f})",
+                    f"Size Error: {size_error:+.3f}",
+                    "",
+                    f"COMMANDS:",
+                    f"Throttle: {throttle:+.2f} (byte: {throttle_byte:3d})",
+                    f"Steering: {steering:+.2f} (byte: {steering_byte:3d})"
+                ]
+                self._render_overlay(frame.shape, status_text)
+                self._overlay_ttl = self.OVERLAY_REFRESH_FRAMES
             
-            # Draw center line
-            cv2.line(frame, (int(self.frame_width/2), 0),
-                    (int(self.frame_width/2), self.frame_height),
-                    (255, 0, 0), 2)
+            cv2.copyTo(self._overlay, self._overlay_mask, frame)
         else:
             # No target detected - stop
             throttle = 0.0
             steering = 0.0
+            self._overlay_ttl = 0  # Re-render as soon as the target is back
             
             cv2.putText(frame, "NO COLOR TARGET DETECTED - STOPPED",
                        (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
         
-        # Show mask in corner
-        mask_small = cv2.resize(mask, (320, 240))
-        mask_colored = cv2.cvtColor(mask_small, cv2.COLOR_GRAY2BGR)
-        frame[10:250, frame.shape[1]-330:frame.shape[1]-10] = mask_colored
+        # Show mask in corner (converted straight into the frame's corner view)
+        mask_small = cv2.resize(mask, (320, 240), dst=self._mask_small)
+        corner = frame[10:250, frame.shape[1]-330:frame.shape[1]-10]
+        cv2.cvtColor(mask_small, cv2.COLOR_GRAY2BGR, dst=corner)
         
         return throttle, steering, frame
     
+    def _render_overlay(self, shape, status_text):
+        """Rasterize status text and center line onto the persistent overlay layer."""
+        overlay = np.zeros(shape, dtype=np.uint8)
+        
+        y_offset = 30
+        for i, text in enumerate(status_text):
+            if text == "":
+                y_offset += 10
+                continue
+            color = (0, 255, 255) if i >= 4 else (0, 255, 0)
+            cv2.putText(overlay, text, (10, y_offset),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            y_offset += 25
+        
+        # Center line
+        half_w = shape[1] // 2
+        cv2.line(overlay, (half_w, 0), (half_w, shape[0]), (255, 0, 0), 2)
+        
+        self._overlay = overlay
+        # Single-channel copy mask: channel sum saturates, so nonzero = drawn pixel
+        self._overlay_mask = cv2.transform(overlay, _CHANNEL_SUM)
+    
     def process_manual_input(self, key):
         """Process manual control input."""
         if key == ord('w'):
@@ -391,10 +535,7 @@ class ColorNavigationController:
             print("\nRunning without BLE connection (simulation mode)")
             print("Commands will be calculated but not sent.\n")
         
-        # Window setup
         window_name = "Color Navigation - Press 'h' for help"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(window_name, 1280, 720)
         
         print("\n" + "="*60)
         print("COLOR NAVIGATION CONTROLLER")
@@ -416,11 +557,22 @@ class ColorNavigationController:
         ble_task = asyncio.create_task(self._ble_sender_task())
         frame_count = 0
         
+        # Start grabber thread
+        self._start_grabber()
+        
+        # Start display thread (creates the window)
+        if self._threaded_display:
+            self._display_thread = threading.Thread(target=self._display_loop,
+                                                    args=(window_name,), daemon=True)
+            self._display_thread.start()
+        else:
+            self._open_window(window_name)
+        
         try:
             while self.running:
-                ret, frame = self.cap.read()
+                frame = await self._next_frame()
                 
-                if not ret or frame is None:
+                if frame is None:
                     print("Failed to read frame")
                     break
                 
@@ -454,30 +606,43 @@ class ColorNavigationController:
                 self.send_motor_command(throttle, steering)
                 
                 # Display frame
-                cv2.imshow(window_name, frame)
+                if self._threaded_display:
+                    # Hand the frame to the display thread, replacing any unshown one
+                    try:
+                        self._display_q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    self._display_q.put_nowait(frame)
+                else:
+                    cv2.imshow(window_name, frame)
+                    key = cv2.waitKey(1) & 0xFF
+                    if key != 0xFF:
+                        self._key_q.put(key)
                 
                 # Handle keyboard input
-                key = cv2.waitKey(1) & 0xFF
-                
-                if key == ord('q'):
-                    print("\nQuitting...")
-                    break
-                elif key == ord('p'):
-                    if not self.manual_mode:
-                        self.autonomous_mode = not self.autonomous_mode
-                        print(f"Autonomous mode: {'ON' if self.autonomous_mode else 'OFF'}")
-                elif key == ord('m'):
-                    self.manual_mode = not self.manual_mode
+                while not self._key_q.empty():
+                    key = self._key_q.get_nowait()
+                    
+                    if key == ord('q'):
+                        print("\nQuitting...")
+                        self.running = False
+                        break
+                    elif key == ord('p'):
+                        if not self.manual_mode:
+                            self.autonomous_mode = not self.autonomous_mode
+                            print(f"Autonomous mode: {'ON' if self.autonomous_mode else 'OFF'}")
+                    elif key == ord('m'):
+                        self.manual_mode = not self.manual_mode
+                        if self.manual_mode:
+                            self.autonomous_mode = False
+                        print(f"Manual mode: {'ON' if self.manual_mode else 'OFF'}")
+                    
+                    # Manual control input
                     if self.manual_mode:
-                        self.autonomous_mode = False
-                    print(f"Manual mode: {'ON' if self.manual_mode else 'OFF'}")
-                
-                # Manual control input
-                if self.manual_mode:
-                    self.process_manual_input(key)
+                        self.process_manual_input(key)
                 
-                # Fast camera loop
-                await asyncio.sleep(0.001)
+                # Let the BLE sender run even if the next frame is already waiting
+                await asyncio.sleep(0)
         
         except KeyboardInterrupt:
             print("\nInterrupted by user")
@@ -490,11 +655,13 @@ class ColorNavigationController:
             await asyncio.sleep(0.2)
             ble_task.cancel()
             
-            if self.cap:
-                self.cap.release()
+            if self._display_thread is not None:
+                self._display_thread.join(timeout=1.0)
+            else:
+                cv2.destroyAllWindows()
+            self._stop_grabber()
             if self.ble_client and self.ble_client.is_connected:
                 await self.ble_client.disconnect()
-            cv2.destroyAllWindows()
             
             print(f"Total frames processed: {frame_count}")
             print("Goodbye!")
@@ -10,6 +10,7 @@ import cv2
 import numpy as np
 import sys
 import os
+import time
 
 # Add parent directory to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -25,6 +26,19 @@ class TargetDetector:
     
     def __init__(self, config):
         self.config = config
+        # Annotate the frame with the detection (off when navigation runs headless)
+        self.draw = not config.get('navigation', {}).get('headless', False)
+    
+    def redraw(self, frame):
+        """
+        Draw the annotations of the last detect() call on another frame.
+        
+        Used for frames the detector was skipped on, so the overlay doesn't blink.
+        
+        Returns:
+            The annotated frame
+        """
+        return frame
     
     def detect(self, frame):
         """
@@ -58,10 +72,19 @@ class ArucoTargetDetector(TargetDetector):
         
         self.target_distance_cm = nav_cfg.get('target_distance_cm', 50.0)
         self.distance_tolerance_cm = nav_cfg.get('distance_tolerance_cm', 3.0)
+        self._drawn = None  # (corners, ids) last drawn, for redraw
+    
+    def redraw(self, frame):
+        """Draw the last detected markers on another frame."""
+        if self._drawn is None:
+            return frame
+        return self.detector.draw_detections(frame, *self._drawn,
+                                             show_distance=True, show_id=True)
     
     def detect(self, frame):
         """Detect ArUco marker."""
         corners, ids, rejected = self.detector.detect(frame)
+        self._drawn = None
         
         if ids is not None and len(ids) > 0:
             marker_info = self.detector.get_marker_info(corners, ids)[0]
@@ -70,11 +93,13 @@ class ArucoTargetDetector(TargetDetector):
             center_y = marker_info['center_y']
             marker_id = marker_info['id']
             
-            frame = self.detector.draw_detections(
-                frame, corners, ids,
-                show_distance=True,
-                show_id=True
-            )
+            if self.draw:
+                self._drawn = (corners, ids)
+                frame = self.detector.draw_detections(
+                    frame, corners, ids,
+                    show_distance=True,
+                    show_id=True
+                )
             
             return {
                 'detected': True,
@@ -111,50 +136,150 @@ class ColorTargetDetector(TargetDetector):
         self.hsv_upper = np.array(color_cfg.get('hsv_upper', [10, 255, 255]))
         self.min_contour_area = color_cfg.get('min_contour_area', 500)
         self.target_area_ratio = color_cfg.get('target_area_ratio', 0.05)
+        self.detection_width = color_cfg.get('detection_width', 320)  # 0 = detect at full resolution
+        # 3x3 rectangle: two passes of it are exactly one pass of a 5x5 rectangle
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        
+        # HSV image and mask, reused every frame (see _alloc_buffers)
+        self._hsv = None
+        self._mask = None
+        self._drawn = None  # (contour, center, mask thumbnail) last drawn, for redraw
+        
+        # Optional OpenCL (T-API) path for the per-pixel mask stages
+        use_opencl = color_cfg.get('use_opencl')
+        if use_opencl is None:
+            use_opencl = cv2.ocl.haveOpenCL()
+        self.use_opencl = use_opencl
+        self._opencl_probe = use_opencl  # Compare against the CPU on the first frame
     
-    def detect(self, frame):
-        """Detect colored target."""
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    def _alloc_buffers(self, height, width):
+        """(Re)allocate the detection-resolution HSV image and mask."""
+        self._hsv = np.empty((height, width, 3), np.uint8)
+        self._mask = np.empty((height, width), np.uint8)
+    
+    def _make_mask(self, frame, size):
+        """Denoised HSV mask at detection size (width, height), on OpenCL while that is faster."""
+        if not self.use_opencl:
+            return self._make_mask_cpu(frame, size)
+        
+        if self._opencl_probe:
+            self._opencl_probe = False
+            mask = self._make_mask_umat(frame, size)  # Warm-up: compiles the OpenCL kernels
+            umat_time = min(self._time_call(self._make_mask_umat, frame, size) for _ in range(3))
+            cpu_time = min(self._time_call(self._make_mask_cpu, frame, size) for _ in range(3))
+            if umat_time >= cpu_time:
+                self.use_opencl = False
+            print(f"Color mask on OpenCL: {umat_time * 1000:.2f} ms, CPU: {cpu_time * 1000:.2f} ms "
+                  f"({'OpenCL' if self.use_opencl else 'CPU'} kept)")
+            return mask
+        
+        return self._make_mask_umat(frame, size)
+    
+    @staticmethod
+    def _time_call(func, *args):
+        """Wall time of one call, in seconds."""
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+    
+    def _make_mask_cpu(self, frame, size):
+        """Mask built in the reused numpy buffers."""
+        width, height = size
+        if self._hsv is None or self._hsv.shape[:2] != (height, width):
+            self._alloc_buffers(height, width)
+        
+        # Convert to HSV (downscaling first), in place in the HSV buffer
+        hsv = self._hsv
+        if frame.shape[:2] != (height, width):
+            cv2.resize(frame, size, dst=hsv, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(hsv, cv2.COLOR_BGR2HSV, dst=hsv)
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv)
+        mask = cv2.inRange(hsv, self.hsv_lower, self.hsv_upper, dst=self._mask)
+        
+        # Morphological operations to reduce noise (in place on the mask):
+        # 5x5 open then 5x5 close, i.e. erode, dilate, dilate, erode, with
+        # each 5x5 pass done as two 3x3 iterations
+        cv2.erode(mask, self._morph_kernel, dst=mask, iterations=2)
+        cv2.dilate(mask, self._morph_kernel, dst=mask, iterations=4)
+        cv2.erode(mask, self._morph_kernel, dst=mask, iterations=2)
+        return mask
+    
+    def _make_mask_umat(self, frame, size):
+        """Same stages as _make_mask_cpu on a cv2.UMat; only the mask is downloaded."""
+        image = cv2.UMat(frame)
+        if frame.shape[:2] != (size[1], size[0]):
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
         mask = cv2.inRange(hsv, self.hsv_lower, self.hsv_upper)
+        mask = cv2.erode(mask, self._morph_kernel, iterations=2)
+        mask = cv2.dilate(mask, self._morph_kernel, iterations=4)
+        mask = cv2.erode(mask, self._morph_kernel, iterations=2)
+        return mask.get()
+    
+    def redraw(self, frame):
+        """Draw the last detected contour, center and mask thumbnail on another frame."""
+        if self._drawn is not None:
+            self._draw(frame, *self._drawn)
+        return frame
+    
+    @staticmethod
+    def _draw(frame, contour, center, mask_colored):
+        """Draw the target contour and center, and show the mask in the corner."""
+        cv2.drawContours(frame, [contour], -1, (0, 255, 0), 3)
+        cv2.circle(frame, center, 10, (0, 255, 0), -1)
+        cv2.circle(frame, center, 15, (255, 255, 255), 2)
+        frame[10:250, frame.shape[1]-330:frame.shape[1]-10] = mask_colored
+    
+    def detect(self, frame):
+        """
+        Detect colored target.
         
-        kernel = np.ones((5, 5), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+        Detection runs on a copy downscaled to detection_width; the center and
+        area are reported (and drawn) in full-frame coordinates.
+        """
+        height, width = frame.shape[:2]
+        scale = 1.0
+        if self.detection_width and width > self.detection_width:
+            scale = width / self.detection_width
+            height, width = round(height / scale), self.detection_width
+        mask = self._make_mask(frame, (width, height))
+        self._drawn = None
         
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
         if contours:
             largest_contour = max(contours, key=cv2.contourArea)
-            area = cv2.contourArea(largest_contour)
+            area = cv2.contourArea(largest_contour) * scale * scale
             
             if area >= self.min_contour_area:
-                M = cv2.moments(largest_contour)
-                if M["m00"] != 0:
-                    center_x = int(M["m10"] / M["m00"])
-                    center_y = int(M["m01"] / M["m00"])
-                    
+                # Center of the bounding box, as in ColorNavigationController
+                x, y, w, h = cv2.boundingRect(largest_contour)
+                center_x = int((x + w * 0.5) * scale)
+                center_y = int((y + h * 0.5) * scale)
+                
+                if self.draw:
                     # Draw detection
-                    cv2.drawContours(frame, [largest_contour], -1, (0, 255, 0), 3)
-                    cv2.circle(frame, (center_x, center_y), 10, (0, 255, 0), -1)
-                    cv2.circle(frame, (center_x, center_y), 15, (255, 255, 255), 2)
-                    
+                    if scale != 1.0:
+                        largest_contour = ((largest_contour + 0.5) * scale).astype(np.int32)
                     # Show mask in corner
                     mask_small = cv2.resize(mask, (320, 240))
                     mask_colored = cv2.cvtColor(mask_small, cv2.COLOR_GRAY2BGR)
-                    frame[10:250, frame.shape[1]-330:frame.shape[1]-10] = mask_colored
-                    
-                    return {
-                        'detected': True,
-                        'center_x': center_x,
-                        'center_y': center_y,
-                        'distance_metric': area,  # Use area as distance proxy
-                        'frame': frame,
-                        'info': {
-                            'area': area,
-                            'area_ratio': area / (frame.shape[0] * frame.shape[1]),
-                            'target_area_ratio': self.target_area_ratio
-                        }
+                    self._drawn = (largest_contour, (center_x, center_y), mask_colored)
+                    self._draw(frame, *self._drawn)
+                
+                return {
+                    'detected': True,
+                    'center_x': center_x,
+                    'center_y': center_y,
+                    'distance_metric': area,  # Use area as distance proxy
+                    'frame': frame,
+                    'info': {
+                        'area': area,
+                        'area_ratio': area / (frame.shape[0] * frame.shape[1]),
+                        'target_area_ratio': self.target_area_ratio
                     }
+                }
         
         return {
             'detected': False,
@@ -18,9 +18,14 @@ Controls:
   'q' - Quit
 """
 
+import os
+
+# Leave one core for the capture/BLE threads. Must be set before cv2 is imported,
+# some OpenCV builds read it only when their OpenMP runtime starts.
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 2) - 1)))
+
 import cv2
 import sys
-import os
 import asyncio
 
 # Add parent directory to path
@@ -61,6 +66,12 @@ class UnifiedNavigationController(BaseNavigationController):
         self.target_distance_cm = aruco_nav_cfg.get('target_distance_cm', 50.0)
         self.distance_tolerance_cm = aruco_nav_cfg.get('distance_tolerance_cm', 3.0)
         
+        # Detection amortized over frames (see _detect)
+        self.detect_every = max(1, int(aruco_nav_cfg.get('detect_every', 2)))
+        self._last_detection = None
+        self._frames_since_detection = 0
+        self._center_velocity = 0.0  # Target center x drift, px per frame
+        
         print(f"Initialized with detector: {self.get_current_detector_name()}")
     
     def get_current_detector_name(self):
@@ -74,6 +85,7 @@ class UnifiedNavigationController(BaseNavigationController):
     def switch_detector(self):
         """Switch to next detector type."""
         self.current_detector_index = (self.current_detector_index + 1) % len(self.detector_types)
+        self._last_detection = None
         print(f"\nSwitched to {self.get_current_detector_name()} detector")
     
     def get_current_detector(self):
@@ -81,6 +93,33 @@ class UnifiedNavigationController(BaseNavigationController):
         detector_type = self.detector_types[self.current_detector_index]
         return self.detectors[detector_type]
     
+    def _detect(self, frame):
+        """
+        Run the current detector on 1 of every detect_every frames.
+        
+        In between, the last result is reused for the new frame, with the
+        target center moved along the drift seen between the last two
+        detections, and the last annotations are drawn on it again.
+        """
+        last = self._last_detection
+        if last is not None and self._frames_since_detection < self.detect_every:
+            self._frames_since_detection += 1
+            if not last['detected']:
+                return dict(last, frame=frame)
+            frame = self.get_current_detector().redraw(frame)
+            drift = self._center_velocity * (self._frames_since_detection - 1)
+            return dict(last, frame=frame, center_x=last['center_x'] + drift)
+        
+        detection = self.get_current_detector().detect(frame)
+        if detection['detected'] and last is not None and last['detected']:
+            self._center_velocity = ((detection['center_x'] - last['center_x']) /
+                                     self._frames_since_detection)
+        else:
+            self._center_velocity = 0.0
+        self._last_detection = detection
+        self._frames_since_detection = 1
+        return detection
+    
     def process_frame_autonomous(self, frame):
         """
         Process frame using current detector.
@@ -88,8 +127,7 @@ class UnifiedNavigationController(BaseNavigationController):
         Returns:
             (throttle, steering, frame_with_overlay)
         """
-        detector = self.get_current_detector()
-        detection = detector.detect(frame)
+        detection = self._detect(frame)
         
         throttle = 0.0
         steering = 0.0
@@ -125,12 +163,12 @@ class UnifiedNavigationController(BaseNavigationController):
                 steering_byte = to_byte(steering)
                 
                 status_text = [
-                    f"Target: ArUco ID {info['id']} | Dist: {distance_cm:.1f}cm",
-                    f"Target: {self.target_distance_cm:.1f}cm | Error: {distance_error:+.1f}cm",
-                    "",
-                    f"COMMANDS:",
-                    f"Throttle: {throttle:+.2f} ({throttle_byte:3d})",
-                    f"Steering: {steering:+.2f} ({steering_byte:3d})"
+                    ("Target: ArUco ID ", f"{info['id']}", " | Dist: ", f"{distance_cm:.1f}cm"),
+                    (f"Target: {self.target_distance_cm:.1f}cm | Error: ", f"{distance_error:+.1f}cm"),
+                    (),
+                    ("COMMANDS:",),
+                    ("Throttle: ", f"{throttle:+.2f} ({throttle_byte:3d})"),
+                    ("Steering: ", f"{steering:+.2f} ({steering_byte:3d})")
                 ]
                 
             elif detector_type == 'color':
@@ -154,23 +192,26 @@ class UnifiedNavigationController(BaseNavigationController):
                 steering_byte = to_byte(steering)
                 
                 status_text = [
-                    f"Target: Color @ ({center_x:.0f}, {center_y:.0f})",
-                    f"Area: {area:.0f}px | Ratio: {area_ratio:.3f} (Target: {target_area_ratio:.3f})",
-                    "",
-                    f"COMMANDS:",
-                    f"Throttle: {throttle:+.2f} ({throttle_byte:3d})",
-                    f"Steering: {steering:+.2f} ({steering_byte:3d})"
+                    ("Target: Color @ ", f"({center_x:.0f}, {center_y:.0f})"),
+                    ("Area: ", f"{area:.0f}px", " | Ratio: ", f"{area_ratio:.3f}",
+                     f" (Target: {target_area_ratio:.3f})"),
+                    (),
+                    ("COMMANDS:",),
+                    ("Throttle: ", f"{throttle:+.2f} ({throttle_byte:3d})"),
+                    ("Steering: ", f"{steering:+.2f} ({steering_byte:3d})")
                 ]
             
+            if self.headless:
+                return throttle, steering, frame
+            
             # Draw status overlay
             y_offset = 30
-            for i, text in enumerate(status_text):
-                if text == "":
+            for i, fields in enumerate(status_text):
+                if not fields:
                     y_offset += 10
                     continue
                 color = (0, 255, 255) if i >= 3 else (0, 255, 0)
-                cv2.putText(frame, text, (10, y_offset),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                self._draw_status_line(frame, fields, (10, y_offset), color)
                 y_offset += 25
             
             # Draw center line and target position
@@ -185,11 +226,26 @@ class UnifiedNavigationController(BaseNavigationController):
             throttle = 0.0
             steering = 0.0
             
-            cv2.putText(frame, f"NO {self.get_current_detector_name()} TARGET DETECTED - STOPPED",
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+            self._draw_banner(frame, f"NO {self.get_current_detector_name()} TARGET DETECTED - STOPPED",
+                             (10, 30), 0.8, (0, 0, 255), 2)
         
         return throttle, steering, frame
     
+    def _draw_status_line(self, frame, fields, org, color):
+        """
+        Draw one status line from alternating (label, value, label, ...) fields.
+        
+        Labels come from the banner cache; only the values, which change from
+        frame to frame, are rasterized with cv2.putText.
+        """
+        x, y = org
+        for i, text in enumerate(fields):
+            if i % 2 == 0:
+                x = self._draw_banner(frame, text, (x, y), 0.6, color, 2)
+            else:
+                cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                x += cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0][0] - 2
+    
     async def run_async(self):
         """Main control loop with target switching."""
         if not self.init_camera():
@@ -198,8 +254,7 @@ class UnifiedNavigationController(BaseNavigationController):
         await self.connect_ble()
         
         window_name = "Unified Navigation - Multi-Target"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(window_name, 1280, 720)
+        self._open_window(window_name)
         
         print("\n" + "="*60)
         print("UNIFIED NAVIGATION CONTROLLER")
@@ -219,11 +274,14 @@ class UnifiedNavigationController(BaseNavigationController):
         ble_task = asyncio.create_task(self._ble_sender_task())
         frame_count = 0
         
+        # Capture runs in its own thread so network reads never block the loop
+        self._start_grabber()
+        
         try:
             while self.running:
-                ret, frame = self.cap.read()
+                frame = await self._next_frame()
                 
-                if not ret or frame is None:
+                if frame is None:
                     print("Failed to read frame")
                     break
                 
@@ -233,29 +291,26 @@ class UnifiedNavigationController(BaseNavigationController):
                     throttle = self.manual_throttle
                     steering = self.manual_steering
                     
-                    cv2.putText(frame, f"MANUAL MODE - {self.get_current_detector_name()}",
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 165, 255), 3)
-                    cv2.putText(frame, f"Throttle: {throttle:+.2f} | Steering: {steering:+.2f}",
-                               (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+                    self._draw_banner(frame, f"MANUAL MODE - {self.get_current_detector_name()}",
+                                     (10, 30), 1.0, (0, 165, 255), 3)
+                    self._draw_banner(frame, f"Throttle: {throttle:+.2f} | Steering: {steering:+.2f}",
+                                     (10, 70), 0.7, (0, 165, 255), 2)
                 
                 elif self.autonomous_mode:
                     throttle, steering, frame = self.process_frame_autonomous(frame)
                     
-                    cv2.putText(frame, f"AUTO - {self.get_current_detector_name()}",
-                               (10, frame.shape[0] - 20),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                    self._draw_banner(frame, f"AUTO - {self.get_current_detector_name()}",
+                                     (10, frame.shape[0] - 20), 0.7, (0, 255, 0), 2)
                 else:
                     throttle = 0.0
                     steering = 0.0
                     
-                    cv2.putText(frame, f"PAUSED - {self.get_current_detector_name()}",
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
+                    self._draw_banner(frame, f"PAUSED - {self.get_current_detector_name()}",
+                                     (10, 30), 1.0, (0, 255, 255), 3)
                 
                 self.send_motor_command(throttle, steering)
                 
-                cv2.imshow(window_name, frame)
-                
-                key = cv2.waitKey(1) & 0xFF
+                key = self._show_frame(window_name, frame)
                 
                 if key == ord('q'):
                     print("\nQuitting...")
@@ -265,17 +320,21 @@ class UnifiedNavigationController(BaseNavigationController):
                 elif key == ord('p'):
                     if not self.manual_mode:
                         self.autonomous_mode = not self.autonomous_mode
+                        self._last_detection = None  # Don't reuse a result from before the pause
                         print(f"Autonomous mode: {'ON' if self.autonomous_mode else 'OFF'}")
                 elif key == ord('m'):
                     self.manual_mode = not self.manual_mode
                     if self.manual_mode:
                         self.autonomous_mode = False
+                    self._last_detection = None
                     print(f"Manual mode: {'ON' if self.manual_mode else 'OFF'}")
                 
                 if self.manual_mode:
                     self.process_manual_input(key)
                 
-                await asyncio.sleep(0.001)
+                # Frames pace the loop (_next_frame waits for the grabber);
+                # just let the BLE sender run if the next one is already waiting
+                await asyncio.sleep(0)
         
         except KeyboardInterrupt:
             print("\nInterrupted by user")
@@ -287,11 +346,10 @@ class UnifiedNavigationController(BaseNavigationController):
             await asyncio.sleep(0.2)
             ble_task.cancel()
             
-            if self.cap:
-                self.cap.release()
+            self._stop_grabber()
             if self.ble_client and self.ble_client.is_connected:
                 await self.ble_client.disconnect()
-            cv2.destroyAllWindows()
+            self._close_window()
             
             print(f"Total frames processed: {frame_count}")
             print("Goodbye!")
@@ -17,7 +17,7 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from camera_processing import ArucoDetector
+from camera_processing import ArucoDetector, generate_aruco_marker
 
 
 def test_marker_file():
@@ -65,6 +65,123 @@ def test_marker_file():
     return detected_count > 0
 
 
+def test_roi_detection():
+    """Test that two-stage ROI detection matches full-frame detection."""
+    print("\n" + "="*60)
+    print("TEST: ROI detection vs full-frame detection")
+    print("="*60)
+    
+    # Synthetic 720p scene with two markers on a noisy background
+    rng = np.random.default_rng(0)
+    scene = np.clip(180 + rng.normal(0, 8, (720, 1280)), 0, 255).astype(np.uint8)
+    marker_a = generate_aruco_marker(3, 120)
+    marker_b = generate_aruco_marker(7, 80)
+    scene[300:300 + marker_a.shape[0], 700:700 + marker_a.shape[1]] = marker_a
+    scene[50:50 + marker_b.shape[0], 100:100 + marker_b.shape[1]] = marker_b
+    frame = cv2.cvtColor(scene, cv2.COLOR_GRAY2BGR)
+    
+    full_detector = ArucoDetector(aruco_dict_type="DICT_6X6_250")
+    roi_detector = ArucoDetector(aruco_dict_type="DICT_6X6_250", roi_detection=True)
+    
+    full_corners, full_ids, _ = full_detector.detect(frame)
+    # Second call exercises the tracking path
+    for _ in range(2):
+        roi_corners, roi_ids, _ = roi_detector.detect(frame)
+        
+        assert roi_ids is not None, "ROI detection found no markers"
+        assert sorted(roi_ids.ravel()) == sorted(full_ids.ravel())
+        
+        for corner, marker_id in zip(full_corners, full_ids.ravel()):
+            match = list(roi_ids.ravel()).index(marker_id)
+            assert np.allclose(corner, roi_corners[match], atol=0.5)
+    
+    print(f"✓ ROI detection matches full frame: IDs {sorted(full_ids.ravel())}")
+
+
+def test_roi_detection_small_marker():
+    """Test that ROI detection still finds a marker under 64 px next to a distractor."""
+    print("\n" + "="*60)
+    print("TEST: ROI detection of a small marker")
+    print("="*60)
+    
+    rng = np.random.default_rng(2)
+    scene = np.clip(180 + rng.normal(0, 8, (720, 1280)), 0, 255).astype(np.uint8)
+    marker = generate_aruco_marker(11, 60)
+    scene[400:400 + marker.shape[0], 500:500 + marker.shape[1]] = marker
+    # Dark rectangle: a square-ish candidate that decodes to nothing
+    scene[150:270, 850:1010] = 30
+    frame = cv2.cvtColor(scene, cv2.COLOR_GRAY2BGR)
+    
+    _, full_ids, _ = ArucoDetector(aruco_dict_type="DICT_6X6_250").detect(frame)
+    assert full_ids is not None and full_ids.tolist() == [[11]]
+    
+    roi_detector = ArucoDetector(aruco_dict_type="DICT_6X6_250", roi_detection=True)
+    for _ in range(3):
+        _, roi_ids, _ = roi_detector.detect(frame)
+        assert roi_ids is not None and roi_ids.tolist() == [[11]], "ROI detection missed the small marker"
+    
+    # A marker appearing away from the tracked one is found by the periodic full pass
+    scene[100:100 + marker.shape[0], 150:150 + marker.shape[1]] = generate_aruco_marker(12, 60)
+    frame = cv2.cvtColor(scene, cv2.COLOR_GRAY2BGR)
+    for _ in range(roi_detector.FULL_DETECT_INTERVAL):
+        _, roi_ids, _ = roi_detector.detect(frame)
+    assert sorted(roi_ids.ravel()) == [11, 12]
+    
+    print(f"✓ Small marker found with ROI detection: IDs {sorted(roi_ids.ravel())}")
+
+
+def test_scaled_detection():
+    """Test that half-resolution detection refines corners back to full-resolution accuracy."""
+    print("\n" + "="*60)
+    print("TEST: Half-resolution detection vs full resolution")
+    print("="*60)
+    
+    rng = np.random.default_rng(1)
+    scene = np.clip(180 + rng.normal(0, 8, (720, 1280)), 0, 255).astype(np.uint8)
+    marker_a = generate_aruco_marker(2, 120)
+    marker_b = generate_aruco_marker(9, 90)
+    scene[200:200 + marker_a.shape[0], 300:300 + marker_a.shape[1]] = marker_a
+    scene[400:400 + marker_b.shape[0], 900:900 + marker_b.shape[1]] = marker_b
+    frame = cv2.cvtColor(cv2.GaussianBlur(scene, (3, 3), 0), cv2.COLOR_GRAY2BGR)
+    
+    full_corners, full_ids, _ = ArucoDetector(aruco_dict_type="DICT_6X6_250").detect(frame)
+    half_corners, half_ids, _ = ArucoDetector(aruco_dict_type="DICT_6X6_250", detection_scale=0.5).detect(frame)
+    
+    assert half_ids is not None, "Half-resolution detection found no markers"
+    assert half_ids.tolist() == full_ids.tolist()
+    for full, half in zip(full_corners, half_corners):
+        assert half.shape == (1, 4, 2)
+        assert np.allclose(full, half, atol=0.5)
+    
+    print(f"✓ Half-resolution detection matches full frame: IDs {sorted(full_ids.ravel())}")
+
+
+def test_nanofractal_backend():
+    """Test that the nanofractal backend finds the same markers as OpenCV."""
+    print("\n" + "="*60)
+    print("TEST: nanofractal backend vs OpenCV")
+    print("="*60)
+    
+    nf_detector = ArucoDetector(aruco_dict_type="DICT_6X6_250", backend="nanofractal")
+    if nf_detector.backend != "nanofractal":
+        print("- nanofractal not installed, skipping")
+        return
+    
+    marker = generate_aruco_marker(5, 160)
+    scene = np.full((480, 640), 200, dtype=np.uint8)
+    scene[100:100 + marker.shape[0], 200:200 + marker.shape[1]] = marker
+    frame = cv2.cvtColor(scene, cv2.COLOR_GRAY2BGR)
+    
+    cv_corners, cv_ids, _ = ArucoDetector(aruco_dict_type="DICT_6X6_250").detect(frame)
+    nf_corners, nf_ids, _ = nf_detector.detect(frame)
+    
+    assert nf_ids is not None and nf_ids.tolist() == cv_ids.tolist()
+    assert nf_corners[0].shape == (1, 4, 2)
+    assert np.allclose(nf_corners[0], cv_corners[0], atol=1.0)
+    
+    print(f"✓ nanofractal matches OpenCV: IDs {nf_ids.ravel().tolist()}")
+
+
 def test_camera_detection():
     """Test detection on live camera."""
     print("\n" + "="*60)
@@ -87,32 +204,29 @@ def test_camera_detection():
     
     print("\nTesting detection with different ArUco dictionaries...")
     print("Hold a marker in front of the camera now!")
-    print("Testing for 5 seconds with each dictionary...\n")
+    print("Testing for 5 seconds; every dictionary sees the same frames...\n")
     
-    results = {}
+    detectors = {dict_type: ArucoDetector(aruco_dict_type=dict_type) for dict_type in dict_types}
+    detected_frames = dict.fromkeys(dict_types, 0)
+    test_frames = 50  # Test ~5 seconds at 10fps
     
-    for dict_type in dict_types:
-        print(f"Testing {dict_type}...")
-        detector = ArucoDetector(aruco_dict_type=dict_type)
-        
-        detected_frames = 0
-        test_frames = 50  # Test ~5 seconds at 10fps
+    for i in range(test_frames):
+        ret, frame = cap.read()
+        if not ret or frame is None:
+            continue
         
-        for i in range(test_frames):
-            ret, frame = cap.read()
-            if not ret or frame is None:
-                continue
-            
-            corners, ids, rejected = detector.detect(frame)
+        # Convert once and run every dictionary on the same grayscale frame
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        for dict_type, detector in detectors.items():
+            corners, ids, rejected = detector.detect(gray)
             
             if ids is not None and len(ids) > 0:
-                detected_frames += 1
+                detected_frames[dict_type] += 1
                 if i % 10 == 0:  # Print occasionally
-                    print(f"  Frame {i}: Detected marker IDs: {[id[0] for id in ids]}")
-        
-        detection_rate = (detected_frames / test_frames) * 100
-        results[dict_type] = detection_rate
-        print(f"  Detection rate: {detection_rate:.1f}%\n")
+                    print(f"  Frame {i} ({dict_type}): Detected marker IDs: {[id[0] for id in ids]}")
+    
+    results = {dict_type: (count / test_frames) * 100
+               for dict_type, count in detected_frames.items()}
     
     cap.release()
     
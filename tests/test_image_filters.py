@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Image Filter Tests
+==================
+
+Checks the frame processing steps against their reference OpenCV formulations.
+"""
+
+import cv2
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from camera_processing import (
+    FrameProcessor,
+    ProcessingMode,
+    adjust_brightness,
+    apply_gaussian_blur,
+    convert_to_grayscale,
+    create_processor,
+)
+
+
+def _hsv_brightness(frame, value):
+    """Reference brightness: saturated add on the HSV value channel."""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    h, s, v = cv2.split(hsv)
+    v = cv2.add(v, value)
+    return cv2.cvtColor(cv2.merge((h, s, v)), cv2.COLOR_HSV2BGR)
+
+
+def test_brightness_adjusts_hsv_value():
+    """Test that brightness is added to HSV V, not to each BGR channel."""
+    print("\n" + "="*60)
+    print("TEST: Brightness on HSV value")
+    print("="*60)
+    
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    # Saturated colors are where the two formulations differ most
+    frame[:10, :10] = (0, 0, 200)
+    frame[:10, 10:20] = (200, 40, 0)
+    
+    for value in (-60, 30, 100):
+        expected = _hsv_brightness(frame, value)
+        assert np.array_equal(adjust_brightness(value)(frame), expected)
+        processor = create_processor(ProcessingMode.BRIGHTNESS, value=value, alpha=2.0)
+        assert np.array_equal(processor.process(frame), expected)
+    
+    # Grayscale frames: the frame is the value channel
+    gray = frame[:, :, 0].copy()
+    assert np.array_equal(adjust_brightness(30)(gray), cv2.add(gray, 30))
+    
+    # Same results on the cv2.UMat path (runs on the CPU without an OpenCL device)
+    for use_opencl in (False, True):
+        processor = FrameProcessor(use_opencl=use_opencl, gray_output=True)
+        processor.add_processing_step(convert_to_grayscale)
+        processor.add_processing_step(adjust_brightness(20))
+        expected = cv2.add(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), 20)
+        assert np.array_equal(processor.process(frame), expected)
+        processor = FrameProcessor(use_opencl=use_opencl)
+        processor.add_processing_step(adjust_brightness(30))
+        assert np.array_equal(processor.process(frame), _hsv_brightness(frame, 30))
+    
+    print("✓ Brightness matches the HSV reference")
+
+
+def test_contrast_ignores_value():
+    """Test that contrast mode only applies alpha."""
+    rng = np.random.default_rng(1)
+    frame = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    processor = create_processor(ProcessingMode.CONTRAST, alpha=1.5, value=40)
+    assert np.array_equal(processor.process(frame), cv2.convertScaleAbs(frame, alpha=1.5, beta=0))
+
+
+
+def test_process_reuses_output_buffer():
+    """Test that process() results alias the step buffers and are overwritten by the next call."""
+    rng = np.random.default_rng(2)
+    first = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    second = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    # numpy path: with OpenCL every result is a fresh download from the device
+    processor = FrameProcessor(use_opencl=False)
+    processor.add_processing_step(apply_gaussian_blur(5))
+    
+    result = processor.process(first)
+    kept = result.copy()
+    assert np.array_equal(kept, cv2.GaussianBlur(first, (5, 5), 0))
+    
+    # Same buffer again: an uncopied earlier result now holds the new frame
+    assert processor.process(second) is result
+    assert np.array_equal(result, cv2.GaussianBlur(second, (5, 5), 0))
+    assert np.array_equal(kept, cv2.GaussianBlur(first, (5, 5), 0))
+
+
+if __name__ == "__main__":
+    test_brightness_adjusts_hsv_value()
+    test_contrast_ignores_value()
+    test_process_reuses_output_buffer()